@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Example demonstrating the asyncio connection pool in ai_urllib4.
+
+This script fetches pages from two independent hosts concurrently with
+asyncio.gather, reusing one keep-alive pool per host across rounds.
+"""
+
+import asyncio
+import logging
+import time
+
+from ai_urllib4.async_connectionpool import connection_from_url
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger("async_example")
+
+
+async def fetch_example_com(pool):
+    """Fetch example.com and check the page title."""
+    response = await pool.urlopen("GET", "/")
+    logger.info("example.com: %s %s", response.status, response.reason)
+    if b"Example Domain" in response.data:
+        logger.info("example.com: found 'Example Domain'")
+    return response
+
+
+async def fetch_httpbin(pool):
+    """Fetch httpbin.org/get and print the echoed request."""
+    response = await pool.urlopen("GET", "/get")
+    logger.info("httpbin.org: %s %s", response.status, response.reason)
+    logger.info("httpbin.org: %s", response.data.decode("utf-8", errors="replace"))
+    return response
+
+
+async def main(rounds=2):
+    """Run both fetches concurrently, sharing one pool per host."""
+    example_pool = connection_from_url("http://example.com")
+    httpbin_pool = connection_from_url("http://httpbin.org")
+
+    try:
+        for i in range(rounds):
+            start = time.perf_counter()
+            # The two hosts are independent, so their round trips overlap
+            results = await asyncio.gather(
+                fetch_example_com(example_pool),
+                fetch_httpbin(httpbin_pool),
+                return_exceptions=True,
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Request failed: %s", result)
+            # Later rounds reuse the keep-alive connections from the first
+            logger.info("Round %d took %.3fs", i + 1, time.perf_counter() - start)
+    finally:
+        await example_pool.close()
+        await httpbin_pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -238,7 +238,12 @@ class HTTPHeaderDict(MutableMapping[str, str]):
             else:
                 # Handle NonMappingHeaderContainer
                 try:
-                    if hasattr(headers, 'keys') and hasattr(headers, '__getitem__'):
+                    if hasattr(headers, 'items'):
+                        # e.g. email.message.Message, whose items() keeps
+                        # repeated headers that keys()/[] would collapse
+                        for key, value in headers.items():
+                            self.add(key, value)
+                    elif hasattr(headers, 'keys') and hasattr(headers, '__getitem__'):
                         for key in headers.keys():
                             self.add(key, headers[key])
                     else:
@@ -8,16 +8,47 @@ and optional LLM-powered backends.
 
 from __future__ import annotations
 
+import asyncio
+import collections
+import functools
+import hashlib
 import json
 import logging
 import random
+import re
+import threading
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Deque, Dict, Mapping, Optional
 from urllib.parse import urlparse
 
+from ._collections import RecentlyUsedContainer
+from .async_connectionpool import AsyncHTTPSConnectionPool
+
 log = logging.getLogger(__name__)
 
+
+# Headers suggested when there is nothing learned to adjust them with
+_DEFAULT_HEADERS: Mapping[str, str] = MappingProxyType({
+    "User-Agent": "ai-urllib4/2.1.0 (Smart)",
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.5",
+})
+
+# Markers of a bot challenge on an error page; a 403/429 without any is
+# a block. They appear near the top of the page, so only the head of the
+# body is scanned.
+_CHALLENGE_RE = re.compile(rb"cloudflare|captcha|turnstile", re.IGNORECASE)
+_MARKER_SCAN_LIMIT = 8192
+
+
+@functools.lru_cache(maxsize=4096)
+def _netloc(url: str) -> str:
+    """Return the domain key for a URL (or the input if it's already a domain)."""
+    return urlparse(url).netloc or url
+
+
 class AIBackend(ABC):
     """Abstract base class for AI backends."""
     
@@ -26,37 +57,134 @@ class AIBackend(ABC):
         """Send a prompt to the AI and return the response."""
         pass
 
+    async def aask(self, prompt: str) -> Optional[str]:
+        """
+        Async variant of :meth:`ask`.
+
+        The default implementation runs :meth:`ask` in the loop's default
+        executor so it doesn't block the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.ask, prompt)
+
+    async def close(self) -> None:
+        """Release any connections held by the backend."""
+        pass
+
 class GeminiBackend(AIBackend):
     """Backend for Google Gemini AI."""
-    
-    def __init__(self, api_key: str, model: str = "gemini-1.5-flash"):
+
+    host = "generativelanguage.googleapis.com"
+
+    def __init__(
+        self,
+        api_key: str,
+        model: str = "gemini-1.5-flash",
+        maxsize: int = 10,
+        cache_maxsize: int = 512,
+        cache_ttl: float = 3600.0,
+    ):
         self.api_key = api_key
         self.model = model
-        self.url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent?key={api_key}"
+        self.path = f"/v1beta/models/{model}:generateContent?key={api_key}"
+        self.url = f"https://{self.host}{self.path}"
+        self.maxsize = maxsize
+        # Keep-alive pool for aask(), created lazily on the running loop
+        self._pool: Optional[AsyncHTTPSConnectionPool] = None
+        self._pool_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Answers to recent prompts: sha1(prompt) -> (expiry, answer).
+        # Prompts are templated, so identical ones recur often.
+        self.cache_ttl = cache_ttl
+        self._answers = RecentlyUsedContainer(cache_maxsize)
 
-    def ask(self, prompt: str) -> Optional[str]:
-        import urllib.request
-        
+    @staticmethod
+    def _cache_key(prompt: str) -> bytes:
+        return hashlib.sha1(prompt.encode("utf-8")).digest()
+
+    def _cached_answer(self, key: bytes) -> Optional[str]:
+        try:
+            expires, answer = self._answers[key]
+        except KeyError:
+            return None
+        if time.monotonic() >= expires:
+            try:
+                del self._answers[key]
+            except KeyError:
+                pass
+            return None
+        return answer
+
+    def _cache_answer(self, key: bytes, answer: str) -> str:
+        self._answers[key] = (time.monotonic() + self.cache_ttl, answer)
+        return answer
+
+    @staticmethod
+    def _build_request(prompt: str) -> bytes:
         data = {
             "contents": [{
                 "parts": [{"text": prompt}]
             }]
         }
-        
+        return json.dumps(data).encode("utf-8")
+
+    @staticmethod
+    def _parse_answer(payload: Any) -> str:
+        return json.loads(payload)['candidates'][0]['content']['parts'][0]['text']
+
+    def ask(self, prompt: str) -> Optional[str]:
+        import urllib.request
+
+        key = self._cache_key(prompt)
+        cached = self._cached_answer(key)
+        if cached is not None:
+            return cached
+
         try:
             req = urllib.request.Request(
                 self.url,
-                data=json.dumps(data).encode("utf-8"),
+                data=self._build_request(prompt),
                 headers={"Content-Type": "application/json"},
                 method="POST"
             )
             with urllib.request.urlopen(req) as response:
-                res_data = json.loads(response.read().decode("utf-8"))
-                return res_data['candidates'][0]['content']['parts'][0]['text']
+                return self._cache_answer(key, self._parse_answer(response.read()))
         except Exception as e:
             log.warning(f"Error querying Gemini: {e}")
             return None
 
+    async def aask(self, prompt: str) -> Optional[str]:
+        key = self._cache_key(prompt)
+        cached = self._cached_answer(key)
+        if cached is not None:
+            return cached
+
+        loop = asyncio.get_running_loop()
+        if self._pool is None or self._pool_loop is not loop:
+            # Pooled streams are bound to the loop that opened them
+            self._pool = AsyncHTTPSConnectionPool(self.host, maxsize=self.maxsize, block=True)
+            self._pool_loop = loop
+
+        try:
+            response = await self._pool.urlopen(
+                "POST",
+                self.path,
+                body=self._build_request(prompt),
+                headers={"Content-Type": "application/json"},
+            )
+            if response.status != 200:
+                log.warning(f"Gemini returned HTTP {response.status}")
+                return None
+            return self._cache_answer(key, self._parse_answer(response.data))
+        except Exception as e:
+            log.warning(f"Error querying Gemini: {e}")
+            return None
+
+    async def close(self) -> None:
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+            self._pool_loop = None
+
 class AIInsights:
     """Stores AI-driven insights for a domain."""
     def __init__(self):
@@ -65,77 +193,83 @@ class AIInsights:
         self.last_status = None
         self.avg_delay = 0.5  # Seconds
         self.total_requests = 0
-        self.history: List[Dict[str, Any]] = []
+        self.history: Deque[Dict[str, Any]] = collections.deque(maxlen=50)
+        # Guards the read-modify-write updates in learn_from_response
+        self._lock = threading.Lock()
 
 class AISmartConfig:
     """AI-powered configuration advisor."""
     
     def __init__(self, backend: Optional[AIBackend] = None):
-        self._insights: Dict[str, AIInsights] = {}
+        self._insights: Dict[str, AIInsights] = collections.defaultdict(AIInsights)
         self.backend = backend
 
     def _get_insights(self, domain_or_url: str) -> AIInsights:
-        domain = urlparse(domain_or_url).netloc or domain_or_url
-        if domain not in self._insights:
-            self._insights[domain] = AIInsights()
-        return self._insights[domain]
+        return self._insights[_netloc(domain_or_url)]
 
     def get_domain_insights(self, domain: str) -> Dict[str, Any]:
         i = self._get_insights(domain)
-        return {
-            "success_rate": i.success_count / max(1, i.total_requests),
-            "avg_delay": i.avg_delay,
-            "total_requests": i.total_requests
-        }
+        with i._lock:
+            return {
+                "success_rate": i.success_count / max(1, i.total_requests),
+                "avg_delay": i.avg_delay,
+                "total_requests": i.total_requests
+            }
 
     def classify_response(self, response: Any) -> str:
         """Classify a response as success, challenge, or block."""
         if 200 <= response.status < 300:
             return "success"
         
-        body = (getattr(response, 'data', b"") or b"").lower()
         if response.status in (403, 429):
-            if b"cloudflare" in body or b"captcha" in body or b"turnstile" in body:
+            body = getattr(response, 'data', b"") or b""
+            if _CHALLENGE_RE.search(body[:_MARKER_SCAN_LIMIT]):
                 return "challenge"
             return "block"
         
         return "error"
 
-    def learn_from_response(self, url: str, response: Any, elapsed: float):
-        """Update domain insights based on response."""
-        domain = urlparse(url).netloc or url
-        i = self._get_insights(domain)
-        i.total_requests += 1
-        i.last_status = response.status
-        
+    def learn_from_response(self, url: str, response: Any, elapsed: float, domain: Optional[str] = None):
+        """
+        Update domain insights based on response.
+
+        Callers that already know the domain (e.g. a pool bound to one
+        host) can pass it as ``domain`` to skip parsing ``url``.
+        """
+        i = self._get_insights(domain or url)
         classification = self.classify_response(response)
-        if classification == "success":
-            i.success_count += 1
-            i.avg_delay = (i.avg_delay * 0.9) + (elapsed * 0.1)
-        else:
-            i.failure_count += 1
-            i.avg_delay *= 1.2 # Slighly increase delay
-
-        i.history.append({
-            "status": response.status,
-            "classification": classification,
-            "elapsed": elapsed
-        })
-        if len(i.history) > 50: i.history.pop(0)
-
-    def suggest_headers(self, url: str) -> Dict[str, str]:
-        """Suggest optimal headers for a URL."""
-        domain = urlparse(url).netloc or url
-        i = self._get_insights(domain)
 
-        headers = {
-            "User-Agent": "ai-urllib4/2.1.0 (Smart)",
-            "Accept": "*/*",
-            "Accept-Language": "en-US,en;q=0.5",
-        }
+        with i._lock:
+            i.total_requests += 1
+            i.last_status = response.status
+
+            if classification == "success":
+                i.success_count += 1
+                i.avg_delay = (i.avg_delay * 0.9) + (elapsed * 0.1)
+            else:
+                i.failure_count += 1
+                i.avg_delay *= 1.2 # Slighly increase delay
+
+            i.history.append({
+                "status": response.status,
+                "classification": classification,
+                "elapsed": elapsed
+            })
+
+    def suggest_headers(self, url: str, domain: Optional[str] = None) -> Mapping[str, str]:
+        """
+        Suggest optimal headers for a URL, or for ``domain`` if given.
+
+        The returned mapping is read-only: unless the LLM backend adjusted
+        them, the shared default headers are returned as-is. Copy it
+        before modifying.
+        """
+        domain = domain or _netloc(url)
+        i = self._get_insights(domain)
 
         # If LLM is available and we're struggling, ask for help
         if self.backend and i.failure_count > 0:
+            headers = dict(_DEFAULT_HEADERS)
             prompt = f"Optimize HTTP headers for {domain} following {i.failure_count} recent failures. Return ONLY a JSON dictionary."
             advice = self.backend.ask(prompt)
             if advice:
@@ -148,8 +282,9 @@ class AISmartConfig:
                         headers.update(new_headers)
                 except:
                     pass
-            
-        return headers
+            return MappingProxyType(headers)
+
+        return _DEFAULT_HEADERS
 
     def suggest_retry_strategy(self, url: str, response: Any) -> Dict[str, Any]:
         """Suggest a retry strategy based on the response."""
@@ -162,10 +297,9 @@ class AISmartConfig:
             
         return {"retry": False}
 
-    def detect_anomaly(self, response: Any) -> Dict[str, Any]:
+    def detect_anomaly(self, response: Any, domain: Optional[str] = None) -> Dict[str, Any]:
         """Detect unusual response characteristics."""
-        url = getattr(response, 'request_url', '')
-        i = self._get_insights(url)
+        i = self._get_insights(domain or getattr(response, 'request_url', ''))
         
         is_anomaly = False
         reason = None
@@ -180,6 +314,6 @@ def optimize_params_for(url: str) -> Dict[str, Any]:
     """Returns a dict of optimized parameters for the given URL."""
     config = AISmartConfig()
     return {
-        "headers": config.suggest_headers(url),
+        "headers": dict(config.suggest_headers(url)),
         "timeout": 30.0
     }
@@ -7,20 +7,60 @@ This module provides async classes for managing pools of connections.
 from __future__ import annotations
 
 import asyncio
+import functools
 import logging
+import socket
+import ssl
+import time
 import typing
 from urllib.parse import urlparse
 
+from ._collections import HTTPHeaderDict, RecentlyUsedContainer
 # We'll use the sync exceptions for now, or define new async ones if needed
-from .exceptions import ClosedPoolError, EmptyPoolError, PoolError
+from .exceptions import ClosedPoolError, EmptyPoolError, PoolError, ProtocolError
+from .response import HTTPResponse
+from .util.timeout import Timeout
 
 log = logging.getLogger(__name__)
 
+# Read size for bodies delimited by connection close
+_READ_CHUNK_SIZE = 65536
+
+# Methods that are safe to resend if the server closes the connection
+# before answering them
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+def _max_age(cache_control: str) -> int | None:
+    """
+    Return how long a response may be reused according to its
+    ``Cache-Control`` header, or None if it must not be stored.
+    """
+    max_age = None
+    for directive in cache_control.lower().split(","):
+        name, _, value = directive.strip().partition("=")
+        if name in ("no-store", "no-cache"):
+            return None
+        if name == "max-age":
+            try:
+                max_age = int(value.strip('"'))
+            except ValueError:
+                return None
+    return max_age
+
+
+@functools.lru_cache(maxsize=128)
+def _encode_headers(items: tuple[tuple[str, str], ...]) -> bytes:
+    """Serialize request headers; callers tend to reuse the same few sets."""
+    return "".join(f"{k}: {v}\r\n" for k, v in items).encode("latin-1")
+
 
 class AsyncConnectionPool:
     """
     Base class for async connection pools.
     """
+
+    __slots__ = ("host", "port")
     
     def __init__(self, host: str, port: int | None = None):
         self.host = host
@@ -43,16 +83,45 @@ class AsyncHTTPConnectionPool(AsyncConnectionPool):
     """
     
     scheme = "http"
-    
+    default_port = 80
+
+    __slots__ = (
+        "timeout",
+        "maxsize",
+        "block",
+        "conn_kw",
+        "pool",
+        "num_connections",
+        "num_requests",
+        "closed",
+        "_sem",
+        "_static_headers",
+        "_static_header_lines",
+        "_response_cache",
+    )
+
     def __init__(
         self,
         host: str,
         port: int | None = None,
         timeout: float | None = None,
-        maxsize: int = 1,
+        maxsize: int = 10,
         block: bool = False,
+        cache_maxsize: int = 0,
         **conn_kw: typing.Any,
     ):
+        """
+        :param timeout: Default timeout for requests: seconds, ``None`` for
+            no timeout, or a :class:`Timeout`
+        :param maxsize: Maximum number of concurrent connections to the host.
+            At most ``maxsize`` requests are in flight at once; idle
+            connections are kept for reuse.
+        :param block: Whether to wait for a free connection when ``maxsize``
+            requests are already in flight, instead of raising
+            :class:`EmptyPoolError`.
+        :param cache_maxsize: Number of fresh ``GET`` responses to keep in
+            memory, honoring ``Cache-Control: max-age``. Disabled when 0.
+        """
         super().__init__(host, port)
         self.timeout = timeout
         self.maxsize = maxsize
@@ -60,38 +129,251 @@ class AsyncHTTPConnectionPool(AsyncConnectionPool):
         self.conn_kw = conn_kw
         self.pool: asyncio.Queue[typing.Any] = asyncio.Queue(maxsize=maxsize)
         self.num_connections = 0
+        self.num_requests = 0
         self.closed = False
-        
-    async def _get_conn(self) -> typing.Any:
-        """Get a connection from the pool."""
+        # Caps in-flight requests; acquired in _get_conn, released in _put_conn
+        self._sem = asyncio.Semaphore(maxsize)
+        # Header block shared by every request sent through this pool
+        host_header = host if port in (None, self.default_port) else f"{host}:{port}"
+        self._static_header_lines = (
+            ("host", f"Host: {host_header}\r\n".encode("ascii")),
+            ("connection", b"Connection: keep-alive\r\n"),
+            ("user-agent", b"User-Agent: ai_urllib4/2.0.0\r\n"),
+        )
+        self._static_headers = b"".join(line for _, line in self._static_header_lines)
+        # (path, request headers) -> (expiry, response)
+        self._response_cache = RecentlyUsedContainer(cache_maxsize) if cache_maxsize > 0 else None
+
+    async def _get_conn(
+        self, connect_timeout: float | None = None
+    ) -> tuple[tuple[asyncio.StreamReader, asyncio.StreamWriter], bool]:
+        """
+        Get a connection from the pool.
+
+        Returns the connection and whether it is an idle one being reused,
+        rather than one opened for this call.
+
+        :param connect_timeout: Seconds to allow for opening a new connection
+        """
         if self.closed:
             raise ClosedPoolError(self, "Pool is closed")
-            
+
+        if self._sem.locked() and not self.block:
+            raise EmptyPoolError(self, "Pool is empty and blocking is disabled")
+
+        await self._sem.acquire()
         try:
-            # Try to get a connection from the queue without blocking first
-            return self.pool.get_nowait()
-        except asyncio.QueueEmpty:
-            if self.num_connections < self.maxsize:
-                # Create a new connection place holder (mocking actual connection creation for this stub)
-                self.num_connections += 1
-                return self._new_conn()
-            
-            if not self.block:
-                raise EmptyPoolError(self, "Pool is empty and blocking is disabled")
-                
-            # Wait for a connection
-            return await self.pool.get()
-
-    def _new_conn(self) -> typing.Any:
-        # Placeholder for actual async connection creation
-        return object()
-
-    async def _put_conn(self, conn: typing.Any) -> None:
-        """Put a connection back into the pool."""
+            while True:
+                try:
+                    # Reuse an idle connection if there is one
+                    conn = self.pool.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                # Drop connections the peer (or a previous error) already closed
+                if self._is_conn_alive(conn):
+                    return conn, True
+                self._discard_conn(conn)
+
+            # Holding the semaphore with no idle connection left guarantees
+            # that num_connections < maxsize here.
+            return await self._open_conn(connect_timeout), False
+        except BaseException:
+            self._sem.release()
+            raise
+
+    async def _open_conn(self, timeout: float | None = None) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        self.num_connections += 1
+        try:
+            return await asyncio.wait_for(self._new_conn(), timeout)
+        except BaseException:
+            self.num_connections -= 1
+            raise
+
+    async def _new_conn(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        """Open a new ``(reader, writer)`` stream pair to the pool's host."""
+        port = self.port or self.default_port
+        log.debug("Starting new %s connection (%d): %s:%s", self.scheme.upper(), self.num_connections, self.host, port)
+        reader, writer = await asyncio.open_connection(self.host, port, ssl=self._get_ssl_context())
+
+        # Requests are small writes followed by a read; don't let Nagle's
+        # algorithm hold them back waiting for a delayed ACK. The stdlib
+        # loops already do this, but third-party loops may not.
+        sock = writer.get_extra_info("socket")
+        if sock is not None and sock.family in (socket.AF_INET, socket.AF_INET6):
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return reader, writer
+
+    def _get_ssl_context(self) -> ssl.SSLContext | None:
+        return None
+
+    async def warmup(self) -> None:
+        """
+        Pre-open connections until the pool holds ``maxsize`` of them, so
+        that the first requests don't pay for connection setup.
+
+        The connections are opened concurrently, so warming up costs about
+        one connection setup rather than ``maxsize`` of them.
+        """
         if self.closed:
             return
-            
-        await self.pool.put(conn)
+        # Hold a slot for each connection opened, as a request would, so
+        # requests running meanwhile can't push the total past maxsize.
+        # Acquiring a free slot doesn't yield, so the count can't go stale.
+        slots = 0
+        while self.num_connections + slots < self.maxsize and not self._sem.locked():
+            await self._sem.acquire()
+            slots += 1
+        try:
+            connect_timeout, _ = self._split_timeout(self.timeout)
+            results = await asyncio.gather(
+                *(self._open_conn(connect_timeout) for _ in range(slots)), return_exceptions=True
+            )
+            error = None
+            for result in results:
+                if isinstance(result, BaseException):
+                    error = error or result
+                    continue
+                if not self.closed:
+                    try:
+                        self.pool.put_nowait(result)
+                        continue
+                    except asyncio.QueueFull:
+                        pass
+                self._discard_conn(result)
+        finally:
+            for _ in range(slots):
+                self._sem.release()
+        # Keep whatever did connect, but don't hide the failure
+        if error is not None:
+            raise error
+
+    @staticmethod
+    def _split_timeout(timeout: typing.Any) -> tuple[float | None, float | None]:
+        """Return the ``(connect, read)`` seconds for a request timeout."""
+        return (
+            getattr(timeout, "connect_timeout", timeout),
+            getattr(timeout, "read_timeout", timeout),
+        )
+
+    @staticmethod
+    def _is_conn_alive(conn: tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> bool:
+        reader, writer = conn
+        return not writer.is_closing() and not reader.at_eof()
+
+    def _discard_conn(self, conn: tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> None:
+        """Close a connection and free its slot in the pool."""
+        conn[1].close()
+        self.num_connections -= 1
+
+    async def _put_conn(self, conn: tuple[asyncio.StreamReader, asyncio.StreamWriter]) -> None:
+        """Put a connection back into the pool."""
+        try:
+            if self.closed or not self._is_conn_alive(conn):
+                self._discard_conn(conn)
+            else:
+                try:
+                    self.pool.put_nowait(conn)
+                except asyncio.QueueFull:
+                    # Raising here would make urlopen put it back again
+                    self._discard_conn(conn)
+        finally:
+            self._sem.release()
+
+    async def _read_response(
+        self, reader: asyncio.StreamReader, method: str, url: str
+    ) -> tuple[HTTPResponse, bool]:
+        """
+        Read a single HTTP/1.1 response from ``reader``.
+
+        Returns the response, with its body preloaded, and whether the
+        connection can be reused for another request.
+        """
+        while True:
+            # Pull the whole header block in one call instead of line by line
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError as e:
+                if not e.partial:
+                    raise ConnectionResetError("Connection closed by peer") from None
+                raise
+            except asyncio.LimitOverrunError:
+                raise ProtocolError("Response header block too large") from None
+
+            status_line, *header_lines = head[:-4].decode("latin-1").split("\r\n")
+            parts = status_line.split(" ", 2)
+            try:
+                version, status = parts[0], int(parts[1])
+            except (IndexError, ValueError):
+                raise ProtocolError(f"Invalid status line: {status_line!r}") from None
+            # The reason phrase is optional
+            reason = parts[2] if len(parts) > 2 else ""
+
+            # Interim responses (100 Continue, 103 Early Hints, ...) come
+            # before the final one and are skipped; 101 is final, as the
+            # connection stops speaking HTTP after it
+            if not 100 <= status < 200 or status == 101:
+                break
+
+        headers = HTTPHeaderDict()
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers.add(name.strip(), value.strip())
+
+        # After 101 Switching Protocols the connection no longer speaks HTTP.
+        # HTTP/1.0 connections close after the response unless the server
+        # says otherwise.
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.0":
+            keep_alive = connection == "keep-alive"
+        else:
+            keep_alive = status != 101 and connection != "close"
+
+        body = b""
+        if method == "HEAD" or status in (204, 304, 101):
+            # These responses never carry a body
+            pass
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            # Joining the pieces once yields the final bytes object directly,
+            # without repeated concatenation or a trailing bytearray copy
+            chunks = []
+            while True:
+                size_line = await reader.readuntil(b"\r\n")
+                size = int(size_line.split(b";", 1)[0].strip(), 16)
+                if size == 0:
+                    # Skip any trailers up to the terminating blank line
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunk = await reader.readexactly(size + 2)
+                chunks.append(memoryview(chunk)[:-2])
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            # No framing information: the body is delimited by the server
+            # closing the connection, so it can't be reused afterwards.
+            keep_alive = False
+            chunks = []
+            while True:
+                chunk = await reader.read(_READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            body = b"".join(chunks)
+
+        response = HTTPResponse(
+            body=body,
+            headers=headers,
+            status=status,
+            version=11 if version == "HTTP/1.1" else 10,
+            version_string=version,
+            reason=reason,
+            preload_content=True,
+            request_url=url,
+            pool=self,
+        )
+        return response, keep_alive
 
     async def urlopen(
         self,
@@ -99,80 +381,212 @@ class AsyncHTTPConnectionPool(AsyncConnectionPool):
         url: str,
         body: typing.Any = None,
         headers: dict[str, str] | None = None,
+        timeout: typing.Any = Timeout.DEFAULT_TIMEOUT,
         **response_kw: typing.Any,
-    ) -> str:
+    ) -> HTTPResponse:
         """
         Make an async request using asyncio streams.
+
+        :param timeout: Seconds, ``None`` for no timeout, or a
+            :class:`Timeout`; defaults to the pool's timeout. The read
+            timeout bounds sending the request and reading the response.
+
+        The response is returned with its body already read, so the
+        connection is back in the pool by the time this returns.
+
+        Connections are kept alive and reused across requests. If a pooled
+        connection turns out to have been closed by the server, a ``GET``,
+        ``HEAD`` or ``OPTIONS`` request is sent again on a fresh one; other
+        methods may already have been processed, so the error is raised.
         """
-        conn = await self._get_conn()
-        reader = None
-        writer = None
+        # 1. Parse URL (rudimentary for this demo)
+        # Assuming url is just path if host is in pool, or full url
+        path = url
+        if url.startswith("http"):
+            parsed = urlparse(url)
+            path = parsed.path or "/"
+            if parsed.query:
+                path += "?" + parsed.query
+
+        cache_key = None
+        if self._response_cache is not None and method == "GET" and body is None:
+            cache_key = (path, tuple(headers.items()) if headers else ())
+            cached = self._get_cached_response(cache_key, url)
+            if cached is not None:
+                return cached
+
+        conn = None
         try:
-            # 1. Parse URL (rudimentary for this demo)
-            # Assuming url is just path if host is in pool, or full url
-            path = url
-            if url.startswith("http"):
-                parsed = urlparse(url)
-                path = parsed.path or "/"
-
-            # 2. Open Connection
-            # In a real pool, we'd reuse 'conn' if it was an open socket
-            # For this v1, we open a new connection every time
-            reader, writer = await asyncio.open_connection(self.host, self.port or 80)
-
-            # 3. Construct Request
-            request_lines = [
-                f"{method} {path} HTTP/1.1",
-                f"Host: {self.host}",
-                "Connection: close", # Simple one-off
-                "User-Agent: ai_urllib4/2.0.0"
+            # 2. Construct Request: only the request line varies per call.
+            # The pieces are handed to the transport together so they go
+            # out in as few send() calls as possible.
+            if isinstance(body, str):
+                body = body.encode("utf-8")
+            static_headers = self._static_headers
+            if headers:
+                # Like http.client, leave out defaults the caller overrides
+                names = {name.lower() for name in headers}
+                if not names.isdisjoint(name for name, _ in self._static_header_lines):
+                    static_headers = b"".join(
+                        line for name, line in self._static_header_lines if name not in names
+                    )
+            request_parts = [
+                b"%s %s HTTP/1.1\r\n" % (method.encode("ascii"), path.encode("ascii")),
+                static_headers,
             ]
             if headers:
-                for k, v in headers.items():
-                    request_lines.append(f"{k}: {v}")
-            
-            request_lines.append("\r\n")
-            request_data = "\r\n".join(request_lines).encode("ascii")
-
-            # 4. Send Request
-            writer.write(request_data)
-            await writer.drain()
-
-            # 5. Read Response (Basic)
-            response_data = b""
+                request_parts.append(_encode_headers(tuple(headers.items())))
+            if body is not None:
+                request_parts.append(b"Content-Length: %d\r\n\r\n" % len(body))
+                request_parts.append(body)
+            else:
+                request_parts.append(b"\r\n")
+
+            connect_timeout, read_timeout = self._split_timeout(
+                self.timeout if timeout is Timeout.DEFAULT_TIMEOUT else timeout
+            )
+            retry_stale = method.upper() in _IDEMPOTENT_METHODS
             while True:
-                chunk = await reader.read(4096)
-                if not chunk:
-                    break
-                response_data += chunk
-            
-            # 6. Decode (Simulated Response Object)
-            return response_data.decode("utf-8", errors="replace")
+                conn, reused = await self._get_conn(connect_timeout)
+                reader, writer = conn
+                self.num_requests += 1
 
-        except Exception as e:
-            return f"Error: {e}"
-        finally:
-            if writer:
+                # 3. Send Request
+                writer.writelines(request_parts)
+                await asyncio.wait_for(writer.drain(), read_timeout)
+
+                # 4. Read Response
+                try:
+                    response, keep_alive = await asyncio.wait_for(
+                        self._read_response(reader, method, url), read_timeout
+                    )
+                except (ConnectionResetError, asyncio.IncompleteReadError):
+                    if not (reused and retry_stale):
+                        raise
+                    # The server dropped an idle keep-alive connection
+                    retry_stale = False
+                    writer.close()
+                    await self._put_conn(conn)
+                    conn = None
+                    continue
+                break
+
+            if not keep_alive:
                 writer.close()
-                await writer.wait_closed()
             await self._put_conn(conn)
+            conn = None
+
+            if cache_key is not None:
+                self._cache_response(cache_key, response)
+            return response
+
+        except BaseException:
+            if conn is not None:
+                conn[1].close()
+                await self._put_conn(conn)
+            raise
+
+    def _get_cached_response(self, key: tuple[typing.Any, ...], url: str) -> HTTPResponse | None:
+        try:
+            expires, cached = self._response_cache[key]
+        except KeyError:
+            return None
+        if time.monotonic() >= expires:
+            try:
+                del self._response_cache[key]
+            except KeyError:
+                pass
+            return None
+        # Hand out a fresh object so callers can't affect each other
+        return HTTPResponse(
+            body=cached.data,
+            headers=cached.headers.copy(),
+            status=cached.status,
+            version=cached.version,
+            version_string=cached.version_string,
+            reason=cached.reason,
+            preload_content=True,
+            request_url=url,
+            pool=self,
+        )
+
+    def _cache_response(self, key: tuple[typing.Any, ...], response: HTTPResponse) -> None:
+        if response.status != 200 or "vary" in response.headers:
+            return
+        max_age = _max_age(response.headers.get("cache-control", ""))
+        if not max_age:
+            return
+        # Time already spent in upstream caches counts against the
+        # lifetime (RFC 9111, section 4.2.3)
+        age = response.headers.get("age")
+        if age is not None:
+            try:
+                age = int(age)
+            except ValueError:
+                return
+            if age < 0:
+                return
+            max_age -= age
+        if max_age > 0:
+            self._response_cache[key] = (time.monotonic() + max_age, response)
 
     async def close(self) -> None:
         self.closed = True
-        # Drain queue?
-        pass
+        if self._response_cache is not None:
+            self._response_cache.clear()
+        while True:
+            try:
+                _, writer = self.pool.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            writer.close()
+            self.num_connections -= 1
+
+
+class AsyncHTTPSConnectionPool(AsyncHTTPConnectionPool):
+    """
+    Async connection pool for HTTPS connections.
+    """
+
+    scheme = "https"
+    default_port = 443
+
+    __slots__ = ("ssl_context",)
+
+    def __init__(
+        self,
+        host: str,
+        port: int | None = None,
+        timeout: float | None = None,
+        maxsize: int = 10,
+        block: bool = False,
+        cache_maxsize: int = 0,
+        ssl_context: ssl.SSLContext | None = None,
+        **conn_kw: typing.Any,
+    ):
+        """
+        :param ssl_context: SSL context used to wrap connections. Defaults to
+            :func:`ssl.create_default_context`, created on first connect.
+        """
+        super().__init__(host, port, timeout, maxsize, block, cache_maxsize, **conn_kw)
+        self.ssl_context = ssl_context
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        # Building a context loads the CA store, so do it once per pool
+        if self.ssl_context is None:
+            self.ssl_context = ssl.create_default_context()
+        return self.ssl_context
 
 
 def connection_from_url(url: str, **kw: typing.Any) -> AsyncConnectionPool:
     parsed = urlparse(url)
     scheme = parsed.scheme
-    host = parsed.netloc
+    host = parsed.hostname
     port = parsed.port
-    
+
     if scheme == "http":
         return AsyncHTTPConnectionPool(host, port, **kw)
     elif scheme == "https":
-        # For now return HTTP pool as placeholder or implement HTTPS
-        return AsyncHTTPConnectionPool(host, port, **kw)
+        return AsyncHTTPSConnectionPool(host, port, **kw)
     else:
         raise ValueError(f"Unsupported scheme: {scheme}")
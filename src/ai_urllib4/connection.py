@@ -6,14 +6,20 @@ This module provides classes for handling HTTP connections.
 
 from __future__ import annotations
 
+import hashlib
 import http.client
 import logging
+import select
 import socket
 import ssl
 import typing
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+from ._collections import RecentlyUsedContainer
+from .util.connection import create_connection
+from .util.timeout import _DEFAULT_TIMEOUT
+
 log = logging.getLogger(__name__)
 
 # Constants
@@ -41,6 +47,22 @@ class ProxyConfig:
             self.proxy_headers = {}
 
 
+def _create_connection(address, timeout, source_address, socket_options):
+    # http.client and util.connection use different "no timeout given" sentinels
+    if timeout is socket._GLOBAL_DEFAULT_TIMEOUT:
+        timeout = _DEFAULT_TIMEOUT
+    return create_connection(address, timeout, source_address, socket_options)
+
+
+def _sock_readable(sock):
+    """Whether ``sock`` has data or EOF waiting, without blocking."""
+    if hasattr(select, "poll"):
+        poller = select.poll()
+        poller.register(sock, select.POLLIN)
+        return bool(poller.poll(0))
+    return bool(select.select([sock], [], [], 0)[0])
+
+
 class HTTPConnection(http.client.HTTPConnection):
     """
     HTTP connection that supports additional features.
@@ -49,6 +71,11 @@ class HTTPConnection(http.client.HTTPConnection):
     additional features.
     """
 
+    #: Options applied to every socket before it connects, as
+    #: ``(level, optname, value)`` tuples. Disabling Nagle's algorithm
+    #: keeps small requests from stalling on the peer's delayed ACK.
+    default_socket_options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+
     def __init__(
         self,
         host,
@@ -60,7 +87,12 @@ class HTTPConnection(http.client.HTTPConnection):
     ):
         """
         Initialize a new HTTPConnection.
+
+        :param socket_options: Socket options to set before connecting,
+            defaults to :attr:`default_socket_options`. Pass ``[]`` to
+            leave the socket untouched.
         """
+        self.socket_options = kwargs.pop("socket_options", self.default_socket_options)
         super().__init__(
             host=host,
             port=port,
@@ -68,11 +100,25 @@ class HTTPConnection(http.client.HTTPConnection):
             source_address=source_address,
             blocksize=blocksize,
         )
+        self._create_connection = self._new_socket
+
+    def _new_socket(self, address, timeout, source_address):
+        return _create_connection(address, timeout, source_address, self.socket_options)
 
     def connect(self):
         """Connect to the host and port specified in __init__."""
         return super().connect()
 
+    @property
+    def is_connected(self):
+        """
+        Whether the socket is open and the server hasn't closed it.
+
+        An idle keep-alive connection has nothing to read, so a readable
+        socket means the server hung up (or sent something unexpected).
+        """
+        return self.sock is not None and not _sock_readable(self.sock)
+
 
 class HTTPSConnection(http.client.HTTPSConnection):
     """
@@ -82,6 +128,13 @@ class HTTPSConnection(http.client.HTTPSConnection):
     additional features.
     """
 
+    #: Certificates that already passed SPKI pinning / CT verification,
+    #: keyed by (host, SHA-256 of the DER cert, pins, CT policy). Shared by
+    #: all connections so reconnecting to a known server skips the checks.
+    _verified_certs = RecentlyUsedContainer(maxsize=1024)
+
+    default_socket_options = HTTPConnection.default_socket_options
+
     def __init__(
         self,
         host,
@@ -114,14 +167,24 @@ class HTTPSConnection(http.client.HTTPSConnection):
             "blocksize": blocksize,
         }
         
+        self.socket_options = kwargs.pop("socket_options", self.default_socket_options)
         self.spki_pins = kwargs.pop("spki_pins", None)
         self.cert_transparency_policy = kwargs.pop("cert_transparency_policy", None)
+        self._pins_key = (
+            frozenset((host, frozenset(pins)) for host, pins in self.spki_pins.items())
+            if self.spki_pins
+            else None
+        )
 
         # Only pass check_hostname if it's explicitly provided and supported
         if "check_hostname" in kwargs:
             init_kwargs["check_hostname"] = kwargs.pop("check_hostname")
 
         super().__init__(**init_kwargs)
+        self._create_connection = self._new_socket
+
+    def _new_socket(self, address, timeout, source_address):
+        return _create_connection(address, timeout, source_address, self.socket_options)
 
     def connect(self):
         """Connect to the host and port specified in __init__."""
@@ -130,6 +193,8 @@ class HTTPSConnection(http.client.HTTPSConnection):
         if self.spki_pins or self.cert_transparency_policy:
             self._verify_security()
 
+    is_connected = HTTPConnection.is_connected
+
     def _verify_security(self):
         """Perform SPKI pinning and Certificate Transparency verification."""
         if not self.sock:
@@ -141,6 +206,16 @@ class HTTPSConnection(http.client.HTTPSConnection):
             log.warning("Could not get peer certificate for security verification")
             return
 
+        # Hashing the DER bytes is much cheaper than parsing the certificate
+        cache_key = (
+            self.host,
+            hashlib.sha256(binary_cert).digest(),
+            self._pins_key,
+            self.cert_transparency_policy,
+        )
+        if cache_key in self._verified_certs:
+            return
+
         from cryptography import x509
         cert = x509.load_der_x509_certificate(binary_cert)
 
@@ -162,6 +237,8 @@ class HTTPSConnection(http.client.HTTPSConnection):
                 from .exceptions import SSLError
                 raise SSLError(f"Certificate Transparency verification failed for {self.host}")
 
+        self._verified_certs[cache_key] = True
+
 
 class DummyConnection:
     """
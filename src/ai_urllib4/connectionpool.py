@@ -6,16 +6,25 @@ This module provides classes for managing pools of connections.
 
 from __future__ import annotations
 
+import collections
+import http.client
+import itertools
 import logging
+import socket
+import threading
 import typing
-from urllib.parse import urlparse
 
 from .connection import HTTPConnection, HTTPSConnection
 from .exceptions import ClosedPoolError, EmptyPoolError, PoolError
+from .response import HTTPResponse
+from .util.connection import is_connection_dropped
 from .util.timeout import Timeout
+from .util.url import _parse_cached
 
 log = logging.getLogger(__name__)
 
+_GLOBAL_DEFAULT_TIMEOUT = socket._GLOBAL_DEFAULT_TIMEOUT
+
 
 class ConnectionPool:
     """
@@ -23,6 +32,10 @@ class ConnectionPool:
     
     This class provides a base for connection pools.
     """
+
+    # Pools are created per host and live as long as their manager's LRU
+    # keeps them, so they go without a per-instance __dict__
+    __slots__ = ("host", "port")
     
     def __init__(self, host, port=None):
         """
@@ -39,6 +52,50 @@ class ConnectionPool:
         pass
 
 
+class _Waiter:
+    """A thread blocked in ``_get_conn``, waiting to be handed a connection."""
+
+    __slots__ = ("event", "conn")
+
+    def __init__(self):
+        self.event = threading.Event()
+        # Connection handed over by _put_conn; None means "open a new one"
+        self.conn = None
+
+
+# Errors from sending on a keep-alive connection the server already closed
+_STALE_CONN_ERRORS = (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)
+
+# Methods that are safe to pipeline, and to resend if the server closes the
+# connection before answering them
+_PIPELINE_METHODS = frozenset(("GET", "HEAD", "OPTIONS"))
+
+
+class _PipelinedReader:
+    """
+    Socket stand-in that gives every pipelined response the same buffered
+    reader, so bytes read ahead for one response aren't lost to the next.
+    """
+
+    __slots__ = ("_fp",)
+
+    def __init__(self, fp):
+        self._fp = fp
+
+    def makefile(self, mode):
+        return self
+
+    def close(self):
+        # Each response closes its file when done; the reader outlives them
+        pass
+
+    def finish(self):
+        self._fp.close()
+
+    def __getattr__(self, name):
+        return getattr(self._fp, name)
+
+
 class HTTPConnectionPool(ConnectionPool):
     """
     Thread-safe connection pool for HTTP connections.
@@ -48,6 +105,27 @@ class HTTPConnectionPool(ConnectionPool):
     
     scheme = "http"
     ConnectionCls = HTTPConnection
+
+    __slots__ = (
+        "timeout",
+        "maxsize",
+        "block",
+        "spki_pins",
+        "cert_transparency_policy",
+        "conn_kw",
+        "_conn_kw",
+        "num_connections",
+        "num_requests",
+        "_request_numbers",
+        "pool",
+        "_waiters",
+        "_shared",
+        "_retired",
+        "_lock",
+        "closed",
+        "recycle_responses",
+        "_free_responses",
+    )
     
     def __init__(
         self,
@@ -58,6 +136,7 @@ class HTTPConnectionPool(ConnectionPool):
         block=False,
         spki_pins=None,
         cert_transparency_policy=None,
+        recycle_responses=False,
         **conn_kw,
     ):
         """
@@ -70,6 +149,9 @@ class HTTPConnectionPool(ConnectionPool):
         :param block: Whether to block when the pool is full
         :param spki_pins: Dictionary mapping hostnames to sets of SPKI pins
         :param cert_transparency_policy: Certificate Transparency policy
+        :param recycle_responses: Reuse preloaded responses once they are
+            closed, e.g. at the end of a ``with pool.urlopen(...)`` block.
+            Responses must then not be used after closing them.
         :param conn_kw: Additional parameters for the connection
         """
         super().__init__(host, port)
@@ -79,66 +161,229 @@ class HTTPConnectionPool(ConnectionPool):
         self.spki_pins = spki_pins
         self.cert_transparency_policy = cert_transparency_policy
         self.conn_kw = conn_kw.copy() if conn_kw else {}
+
+        # Keyword arguments for every new connection, merged once up front
+        self._conn_kw = dict(self.conn_kw)
+        if self.scheme == "https":
+            self._conn_kw["spki_pins"] = spki_pins
+            self._conn_kw["cert_transparency_policy"] = cert_transparency_policy
+        # Changed only under _lock, together with the idle deque
         self.num_connections = 0
+        # Requests draw numbers from a C-level counter instead of doing a
+        # racy += from many threads; num_requests is the latest one drawn
         self.num_requests = 0
-        self.pool = []
+        self._request_numbers = itertools.count(1)
+        # Idle connections, reused most-recently-released first
+        self.pool = collections.deque(maxlen=maxsize)
+        # Threads blocked in _get_conn, served first-come first-served
+        self._waiters = collections.deque()
+        # Checked-out connections that multiplex requests (HTTP/2), mapped
+        # to the number of requests using them. Retired ones were discarded
+        # while shared and are closed once their last request finishes.
+        self._shared = {}
+        self._retired = {}
+        self._lock = threading.Lock()
         self.closed = False
+        self.recycle_responses = recycle_responses
+        # Closed responses ready for reuse, kept per thread so handing one
+        # out needs no locking
+        self._free_responses = threading.local()
         
     def close(self):
         """Close all connections in the pool."""
-        self.closed = True
-        for conn in self.pool:
+        with self._lock:
+            self.closed = True
+            conns = list(self.pool)
+            self.pool.clear()
+            self.num_connections -= len(conns)
+            waiters = list(self._waiters)
+            self._waiters.clear()
+
+        # Wake blocked threads; they'll see the pool is closed
+        for waiter in waiters:
+            waiter.event.set()
+        for conn in conns:
             conn.close()
-        self.pool = []
         
-    def _get_conn(self):
+    def _get_conn(self, timeout=None):
         """
         Get a connection from the pool.
+
+        A connection that multiplexes requests (HTTP/2) is handed to
+        several callers at once, up to its stream limit. Otherwise reuses
+        an idle connection if there is one, or opens a new one while fewer
+        than ``maxsize`` exist. When the pool is exhausted and ``block`` is
+        set, waits up to ``timeout`` seconds to be handed a connection
+        released by another thread.
+
+        :param timeout: Seconds to wait for a connection when blocking
         """
-        import socket
-        if self.closed:
-            raise ClosedPoolError(self, "Pool is closed")
-            
-        if not self.pool and self.num_connections >= self.maxsize:
-            if not self.block:
+        waiter = None
+        idle = None
+        with self._lock:
+            if self.closed:
+                raise ClosedPoolError(self, "Pool is closed")
+
+            for conn, users in self._shared.items():
+                if users < conn.max_concurrent_streams:
+                    self._shared[conn] = users + 1
+                    return conn
+
+            if self.pool:
+                idle = self.pool.pop()
+                if getattr(idle, "multiplexable", False):
+                    self._shared[idle] = 1
+                    return idle
+            elif self.num_connections < self.maxsize:
+                self.num_connections += 1
+            elif not self.block:
                 raise EmptyPoolError(self, "Pool is empty and blocking is disabled")
-                
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+
+        if idle is not None:
+            if getattr(idle, "sock", None) is not None and is_connection_dropped(idle):
+                # The server closed it while idle; http.client reconnects a
+                # closed connection on its next request
+                log.debug("Resetting dropped connection: %s", self.host)
+                idle.close()
+            return idle
+
+        if waiter is not None:
+            if not waiter.event.wait(timeout):
+                with self._lock:
+                    try:
+                        self._waiters.remove(waiter)
+                    except ValueError:
+                        # Handed a connection just as the wait timed out
+                        pass
+                    else:
+                        raise EmptyPoolError(self, "Pool reached maximum size and no more connections are allowed.")
+            if self.closed:
+                if waiter.conn is not None:
+                    self._put_conn(waiter.conn)
+                raise ClosedPoolError(self, "Pool is closed")
+            if waiter.conn is not None:
+                return waiter.conn
+            # Handed a free slot rather than a connection: open a new one
+
+        try:
+            return self._new_conn()
+        except BaseException:
+            self._release_slot()
+            raise
+
+    def _new_conn(self):
+        """
+        Return a fresh connection. The caller must already hold a slot.
+        """
         # Handle Timeout object properly
         timeout = self.timeout
         if hasattr(timeout, "connect_timeout"):
             timeout = timeout.connect_timeout
         
         if timeout is Timeout.DEFAULT_TIMEOUT or timeout is None:
-            timeout = socket._GLOBAL_DEFAULT_TIMEOUT
-
-        # Create a new connection
-        self.num_connections += 1
-        
-        conn_kw = self.conn_kw.copy()
-        if self.scheme == "https":
-            conn_kw["spki_pins"] = self.spki_pins
-            conn_kw["cert_transparency_policy"] = self.cert_transparency_policy
+            timeout = _GLOBAL_DEFAULT_TIMEOUT
 
         conn = self.ConnectionCls(
             host=self.host,
             port=self.port,
             timeout=timeout,
-            **conn_kw,
+            **self._conn_kw,
         )
         return conn
         
     def _put_conn(self, conn):
         """
         Put a connection back into the pool.
-        
+
+        If a thread is waiting for a connection, it is handed over directly
+        instead of going through the idle deque.
+
         :param conn: The connection to put back
         """
-        if self.closed:
-            conn.close()
+        with self._lock:
+            in_use, retired = self._drop_user(conn)
+            if in_use:
+                return
+            if not retired and not self.closed:
+                if self._waiters:
+                    waiter = self._waiters.popleft()
+                    waiter.conn = conn
+                    waiter.event.set()
+                    return
+                if len(self.pool) < self.maxsize:
+                    self.pool.append(conn)
+                    return
+
+        # Pool closed or full, or discarded while shared
+        conn.close()
+        self._release_slot()
+
+    def _discard_conn(self, conn):
+        """
+        Close a connection for good, freeing its slot in the pool.
+
+        A shared connection is only closed once the other requests using
+        it have finished.
+
+        :param conn: The connection to close
+        """
+        with self._lock:
+            users = self._shared.pop(conn, None) or self._retired.pop(conn, None)
+            if users is not None and users > 1:
+                self._retired[conn] = users - 1
+                return
+        conn.close()
+        self._release_slot()
+
+    def _share_conn(self, conn):
+        """
+        Start handing out ``conn`` to concurrent requests if it turned out
+        to multiplex them (e.g. HTTP/2 was negotiated on connect).
+
+        :param conn: A connection checked out by the caller
+        """
+        if not getattr(conn, "multiplexable", False):
             return
-            
-        self.pool.append(conn)
-        
+        with self._lock:
+            if conn in self._shared or conn in self._retired:
+                return
+            users = 1
+            # Blocked threads can use the new capacity right away
+            while self._waiters and users < conn.max_concurrent_streams:
+                waiter = self._waiters.popleft()
+                waiter.conn = conn
+                waiter.event.set()
+                users += 1
+            self._shared[conn] = users
+
+    def _drop_user(self, conn):
+        """
+        Drop one user of a shared connection. Call with ``_lock`` held.
+
+        :return: ``(in_use, retired)``: whether other requests still use
+            the connection, and whether it was discarded while shared
+        """
+        for table, retired in ((self._shared, False), (self._retired, True)):
+            users = table.get(conn)
+            if users is not None:
+                if users > 1:
+                    table[conn] = users - 1
+                    return True, retired
+                del table[conn]
+                return False, retired
+        return False, False
+
+    def _release_slot(self):
+        with self._lock:
+            if self._waiters and not self.closed:
+                # Let the first waiter open a connection in this slot
+                self._waiters.popleft().event.set()
+            else:
+                self.num_connections -= 1
+
     def urlopen(
         self,
         method,
@@ -153,60 +398,241 @@ class HTTPConnectionPool(ConnectionPool):
         release_conn=None,
         chunked=False,
         body_pos=None,
+        _parsed=None,
         **response_kw,
     ):
         """
         Make a request using a connection from the pool.
+
+        :param _parsed: ``url`` already split by the caller, to avoid
+            parsing it again
         """
-        from .response import HTTPResponse
-        
         # In a real implementation, we would handle retries, redirects, etc.
         # For this enhancement, we'll implement a basic functional version.
         
-        conn = self._get_conn()
+        preload_content = response_kw.get("preload_content", True)
+        if release_conn is None:
+            release_conn = preload_content
+
+        conn = self._get_conn(timeout=pool_timeout)
+        self.num_requests = next(self._request_numbers)
+        self._set_conn_timeout(conn, self.timeout if timeout is Timeout.DEFAULT_TIMEOUT else timeout)
+        # A kept-alive connection can be closed by the server just as it's
+        # reused. The request can then be sent again on a fresh connection
+        # if its body can be replayed and either it never got fully sent or
+        # the method is safe to repeat: the server may have processed it
+        # before hanging up.
+        retry_stale = (
+            getattr(conn, "sock", None) is not None
+            and not getattr(conn, "multiplexable", False)
+            and isinstance(body, (bytes, str, type(None)))
+        )
+        idempotent = method.upper() in _PIPELINE_METHODS
         try:
             # http.client.request expects only the path for the URL in request
             # if it's already connected to the host.
-            parsed = urlparse(url)
-            path = parsed.path
-            if parsed.query:
-                path += "?" + parsed.query
-            if not path:
-                path = "/"
-                
-            conn.request(method, path, body=body, headers=headers or {})
-            res = conn.getresponse()
-            
-            preload_content = response_kw.get("preload_content", True)
-            if preload_content:
-                response_body = res.read()
+            path = (_parsed or _parse_cached(url)).path_with_query
+            while True:
+                sent = False
+                try:
+                    conn.request(method, path, body=body, headers=headers or {})
+                    sent = True
+                    self._share_conn(conn)
+                    res = conn.getresponse()
+                    break
+                except _STALE_CONN_ERRORS:
+                    if not retry_stale or (sent and not idempotent):
+                        raise
+                    retry_stale = False
+                    log.debug("Connection to %s dropped while idle, resending", self.host)
+                    conn.close()
+
+            if isinstance(res, HTTPResponse):
+                # HTTP/2 connections return complete responses
+                response = res
+                response.request_url = url
+                response.connection = None
+                response.pool = self
             else:
-                response_body = None
-            
-            response = HTTPResponse(
-                body=response_body,
-                headers=dict(res.getheaders()),
-                status=res.status,
-                version=res.version,
-                reason=res.reason,
-                preload_content=preload_content,
-                decode_content=True,
-                request_url=url,
-                connection=conn if not preload_content else None,
-                pool=self,
-                original_response=res,
-            )
-            return response
-        except Exception:
-            conn.close()
+                # With preload_content the body is read here; otherwise the
+                # response streams it and releases the connection at EOF.
+                response = self._new_response(
+                    body=res,
+                    headers=res.msg,
+                    status=res.status,
+                    version=res.version,
+                    reason=res.reason,
+                    preload_content=preload_content,
+                    decode_content=True,
+                    request_url=url,
+                    connection=None if preload_content else conn,
+                    pool=self,
+                    original_response=res,
+                )
+        except BaseException:
+            self._discard_conn(conn)
             raise
-        finally:
-            if response_kw.get("preload_content", True):
-                if release_conn:
-                    self._put_conn(conn)
-                else:
-                    conn.close()
-                    self.num_connections -= 1
+
+        if response.connection is None:
+            if release_conn:
+                self._put_conn(conn)
+            else:
+                self._discard_conn(conn)
+        return response
+
+    def _set_conn_timeout(self, conn, timeout):
+        """
+        Apply a request's timeout to a pooled connection.
+
+        Connections outlive requests, so every request sets its own: the
+        connect timeout for when http.client (re)connects, and the read
+        timeout on a socket that is already open.
+
+        :param timeout: Seconds, ``None`` for no timeout, or a
+            :class:`Timeout`
+        """
+        if timeout is Timeout.DEFAULT_TIMEOUT:
+            connect = read = _GLOBAL_DEFAULT_TIMEOUT
+        else:
+            connect = getattr(timeout, "connect_timeout", timeout)
+            read = getattr(timeout, "read_timeout", timeout)
+        conn.timeout = connect
+        if conn.sock is not None:
+            if read is _GLOBAL_DEFAULT_TIMEOUT:
+                read = socket.getdefaulttimeout()
+            if conn.sock.gettimeout() != read:
+                conn.sock.settimeout(read)
+
+    def _new_response(self, preload_content, **response_kw):
+        """
+        Build a response, reusing a closed one if the pool recycles them.
+
+        Only preloaded responses are recycled: nothing is left to stream
+        by the time the caller can close them.
+        """
+        if not (self.recycle_responses and preload_content):
+            return HTTPResponse(preload_content=preload_content, **response_kw)
+
+        free = getattr(self._free_responses, "responses", None)
+        if free is None:
+            free = self._free_responses.responses = []
+        if free:
+            response = free.pop()
+            response.reset(preload_content=True, **response_kw)
+        else:
+            response = HTTPResponse(preload_content=True, **response_kw)
+        response._free_list = free
+        return response
+
+    def urlopen_many(self, requests, pool_timeout=None):
+        """
+        Make several requests over one connection using HTTP/1.1 pipelining.
+
+        All requests are written with a single ``sendall`` and the responses
+        are then read back in order, so a batch costs about one round trip
+        instead of one per request. Bodies are always preloaded.
+
+        Only idempotent requests (``GET``, ``HEAD``, ``OPTIONS``) are
+        pipelined, since a request may have to be sent again if the server
+        closes the connection partway through the batch. Other batches,
+        and connections that multiplex requests (HTTP/2), fall back to one
+        :meth:`urlopen` call per request.
+
+        :param requests: Iterable of ``(method, url, body, headers)`` tuples
+        :param pool_timeout: Seconds to wait for a connection when blocking
+        :return: List of HTTPResponse, in request order
+        """
+        requests = [(method.upper(), url, body, headers) for method, url, body, headers in requests]
+        if len(requests) < 2 or any(r[0] not in _PIPELINE_METHODS for r in requests):
+            return self._urlopen_each(requests, pool_timeout)
+
+        conn = self._get_conn(timeout=pool_timeout)
+        try:
+            if conn.sock is None:
+                conn.connect()
+            if getattr(conn, "multiplexable", False):
+                self._put_conn(conn)
+                return self._urlopen_each(requests, pool_timeout)
+
+            buf = b"".join(self._pipeline_request(conn, *r) for r in requests)
+            responses = []
+            # Whether the server hung up before answering every request
+            dropped = False
+            try:
+                conn.sock.sendall(buf)
+            except _STALE_CONN_ERRORS:
+                dropped = True
+            else:
+                reader = _PipelinedReader(conn.sock.makefile("rb"))
+                try:
+                    for method, url, _, _ in requests:
+                        self.num_requests = next(self._request_numbers)
+                        res = http.client.HTTPResponse(reader, method=method)
+                        try:
+                            res.begin()
+                            response = self._new_response(
+                                body=res,
+                                headers=res.msg,
+                                status=res.status,
+                                version=res.version,
+                                reason=res.reason,
+                                preload_content=True,
+                                decode_content=True,
+                                request_url=url,
+                                pool=self,
+                                original_response=res,
+                            )
+                        except (ConnectionError, http.client.IncompleteRead):
+                            # Closed without Connection: close; keep what
+                            # was answered and resend the rest
+                            dropped = True
+                            break
+                        responses.append(response)
+                        if res.will_close:
+                            dropped = len(responses) < len(requests)
+                            break
+                finally:
+                    reader.finish()
+        except BaseException:
+            self._discard_conn(conn)
+            raise
+
+        if dropped or res.will_close:
+            # Anything the server didn't answer is safe to send again
+            self._discard_conn(conn)
+            responses.extend(self._urlopen_each(requests[len(responses):], pool_timeout))
+        else:
+            self._put_conn(conn)
+        return responses
+
+    def _urlopen_each(self, requests, pool_timeout):
+        return [
+            self.urlopen(method, url, body=body, headers=headers, pool_timeout=pool_timeout)
+            for method, url, body, headers in requests
+        ]
+
+    def _pipeline_request(self, conn, method, url, body, headers):
+        """
+        Serialize one request the way ``http.client`` would send it.
+        """
+        path = _parse_cached(url).path_with_query
+
+        host = conn.host
+        if ":" in host:
+            host = f"[{host}]"
+        if conn.port != conn.default_port:
+            host = f"{host}:{conn.port}"
+
+        if isinstance(body, str):
+            body = body.encode("iso-8859-1")
+        headers = {"Host": host, "Accept-Encoding": "identity", **(headers or {})}
+        if body is not None:
+            headers["Content-Length"] = str(len(body))
+
+        lines = [f"{method} {path} HTTP/1.1"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append("\r\n")
+        return "\r\n".join(lines).encode("iso-8859-1") + (body or b"")
 
 
 class HTTPSConnectionPool(HTTPConnectionPool):
@@ -219,18 +645,21 @@ class HTTPSConnectionPool(HTTPConnectionPool):
     scheme = "https"
     ConnectionCls = HTTPSConnection
 
+    __slots__ = ()
+
 
-def connection_from_url(url, **kw):
+def connection_from_url(url, _parsed=None, **kw):
     """
     Create a connection pool for a URL.
     
     :param url: URL to create a connection pool for
+    :param _parsed: ``url`` already split by the caller
     :param kw: Additional parameters for the connection pool
     :return: Connection pool for the URL
     """
-    parsed_url = urlparse(url)
+    parsed_url = _parsed or _parse_cached(url)
     scheme = parsed_url.scheme
-    host = parsed_url.netloc
+    host = parsed_url.host
     port = parsed_url.port
     
     if scheme == "http":
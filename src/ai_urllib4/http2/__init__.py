@@ -33,9 +33,11 @@ def inject_into_ai_urllib4() -> None:
 
     This function replaces the standard HTTPSConnection with the HTTP/2-capable
     HTTP2Connection, enabling HTTP/2 support for all HTTPS requests made through
-    ai_urllib4.
+    ai_urllib4. HTTPS connection pools then share each connection between
+    concurrent requests.
     """
     import ai_urllib4.connection
+    import ai_urllib4.connectionpool
 
     global orig_HTTPSConnection
 
@@ -47,6 +49,7 @@ def inject_into_ai_urllib4() -> None:
     from .connection import HTTP2Connection
 
     ai_urllib4.connection.HTTPSConnection = HTTP2Connection
+    ai_urllib4.connectionpool.HTTPSConnectionPool.ConnectionCls = HTTP2Connection
 
 
 def extract_from_ai_urllib4() -> None:
@@ -57,6 +60,7 @@ def extract_from_ai_urllib4() -> None:
     for HTTPS requests made through ai_urllib4.
     """
     import ai_urllib4.connection
+    import ai_urllib4.connectionpool
 
     global orig_HTTPSConnection
 
@@ -64,4 +68,5 @@ def extract_from_ai_urllib4() -> None:
         return
 
     ai_urllib4.connection.HTTPSConnection = orig_HTTPSConnection
+    ai_urllib4.connectionpool.HTTPSConnectionPool.ConnectionCls = orig_HTTPSConnection
     orig_HTTPSConnection = None
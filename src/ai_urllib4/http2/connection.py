@@ -25,6 +25,7 @@ from .settings import ConnectionProfile, HTTP2Settings, SettingsManager
 
 # Import h2 conditionally to avoid hard dependency
 try:
+    import h2.config
     import h2.connection
     import h2.events
     import h2.exceptions
@@ -98,7 +99,9 @@ class H2Connection:
                 "Install with: pip install h2"
             )
 
-        self._obj = h2.connection.H2Connection(client_side=client_side)
+        self._obj = h2.connection.H2Connection(
+            config=h2.config.H2Configuration(client_side=client_side)
+        )
         self._lock = threading.RLock()
 
     def __getattr__(self, name: str) -> Any:
@@ -111,14 +114,34 @@ class H2Connection:
         return getattr(self._obj, name)
 
 
+class _StreamState:
+    """Response received so far on one HTTP/2 stream."""
+
+    __slots__ = ("headers", "data", "ended", "reset_code")
+
+    def __init__(self) -> None:
+        self.headers: Optional[List[Tuple[bytes, bytes]]] = None
+        self.data = bytearray()
+        self.ended = False
+        self.reset_code: Optional[int] = None
+
+
 class HTTP2Connection(HTTPSConnection):
     """
     HTTP/2 connection implementation.
 
     This class provides an HTTP/2 connection that can be used as a drop-in
     replacement for HTTPSConnection.
+
+    Once HTTP/2 is negotiated, several threads can send requests on the
+    connection at the same time, each on its own stream. Connection pools
+    share it between concurrent requests (see :attr:`multiplexable`).
     """
 
+    #: Most streams the pool opens on one connection at a time, even if the
+    #: server allows more.
+    max_streams_per_connection = 100
+
     def __init__(
         self,
         host: str,
@@ -132,6 +155,7 @@ class HTTP2Connection(HTTPSConnection):
         http2_settings: Optional[HTTP2Settings] = None,
         flow_control_strategy: FlowControlStrategy = FlowControlStrategy.ADAPTIVE,
         connection_profile: ConnectionProfile = ConnectionProfile.BALANCED,
+        **kwargs: Any,
     ) -> None:
         """
         Initialize a new HTTP2Connection.
@@ -147,6 +171,7 @@ class HTTP2Connection(HTTPSConnection):
         :param http2_settings: HTTP/2 settings
         :param flow_control_strategy: Flow control strategy
         :param connection_profile: Connection profile
+        :param kwargs: Passed on to :class:`~ai_urllib4.connection.HTTPSConnection`
         """
         super().__init__(
             host=host,
@@ -157,12 +182,20 @@ class HTTP2Connection(HTTPSConnection):
             source_address=source_address,
             context=context,
             blocksize=blocksize,
+            **kwargs,
         )
 
         # HTTP/2 specific attributes
         self._h2_conn: Optional[H2Connection] = None
-        self._stream_id: Optional[int] = None
-        self._headers: List[Tuple[bytes, bytes]] = []
+        # The request being built/awaited is per thread, since threads
+        # share the connection; see the _stream_id/_headers properties
+        self._local = threading.local()
+        self._streams: Dict[int, _StreamState] = {}
+        # Guards the h2 state machine and writes to the socket
+        self._write_lock = threading.RLock()
+        # One thread at a time reads frames and routes them to streams
+        self._read_cond = threading.Condition()
+        self._reading = False
         self._window_manager = WindowManager(strategy=flow_control_strategy)
         self._push_manager = PushManager()
 
@@ -172,8 +205,41 @@ class HTTP2Connection(HTTPSConnection):
         else:
             self._settings = http2_settings
 
-        # Default socket options
-        self.socket_options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)]
+    @property
+    def _stream_id(self) -> Optional[int]:
+        return getattr(self._local, "stream_id", None)
+
+    @_stream_id.setter
+    def _stream_id(self, value: Optional[int]) -> None:
+        self._local.stream_id = value
+
+    @property
+    def _headers(self) -> List[Tuple[bytes, bytes]]:
+        return self._local.__dict__.setdefault("headers", [])
+
+    @_headers.setter
+    def _headers(self, value: List[Tuple[bytes, bytes]]) -> None:
+        self._local.headers = value
+
+    @property
+    def multiplexable(self) -> bool:
+        """Whether concurrent requests can share this connection."""
+        return self._h2_conn is not None
+
+    @property
+    def max_concurrent_streams(self) -> int:
+        """How many requests can be in flight on this connection at once."""
+        if self._h2_conn is None:
+            return 1
+        return min(
+            self._h2_conn.remote_settings.max_concurrent_streams,
+            self.max_streams_per_connection,
+        )
+
+    @property
+    def streams_in_use(self) -> int:
+        """Number of requests currently in flight."""
+        return len(self._streams)
 
     def connect(self) -> None:
         """
@@ -185,13 +251,9 @@ class HTTP2Connection(HTTPSConnection):
         if self.sock:
             return
 
-        # Create SSL context if not provided
-        context = self.context
-        if context is None:
-            context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
-
-        # Set ALPN protocols for HTTP/2 negotiation
-        context.set_alpn_protocols(["h2", "http/1.1"])
+        # Set ALPN protocols for HTTP/2 negotiation. http.client always
+        # has a context here, creating a default one if none was given.
+        self._context.set_alpn_protocols(["h2", "http/1.1"])
 
         # Connect to the server
         super().connect()
@@ -290,24 +352,31 @@ class HTTP2Connection(HTTPSConnection):
         # Add header to list
         self._headers.append((header_bytes, value_bytes))
 
-    def endheaders(self, message_body: Optional[Union[bytes, str, List[bytes]]] = None) -> None:
+    def endheaders(
+        self,
+        message_body: Optional[Union[bytes, str, List[bytes]]] = None,
+        *,
+        encode_chunked: bool = False,
+    ) -> None:
         """
         End the headers and send the request.
 
         :param message_body: The message body to send
+        :param encode_chunked: Whether to chunk the body (HTTP/1.1 only)
         """
         if self._h2_conn is None:
-            return super().endheaders(message_body)
+            return super().endheaders(message_body, encode_chunked=encode_chunked)
 
-        # Get a new stream ID
-        self._stream_id = self._h2_conn.get_next_available_stream_id()
-
-        # Send headers
         end_stream = message_body is None
-        self._h2_conn.send_headers(self._stream_id, self._headers, end_stream=end_stream)
+        with self._write_lock:
+            # Get a new stream ID
+            stream_id = self._h2_conn.get_next_available_stream_id()
+            self._streams[stream_id] = _StreamState()
 
-        # Send the data
-        self.sock.sendall(self._h2_conn.data_to_send())
+            # Send headers
+            self._h2_conn.send_headers(stream_id, self._headers, end_stream=end_stream)
+            self.sock.sendall(self._h2_conn.data_to_send())
+        self._stream_id = stream_id
 
         # Send message body if provided
         if message_body is not None:
@@ -336,11 +405,9 @@ class HTTP2Connection(HTTPSConnection):
         elif not isinstance(data, bytes):
             raise TypeError(f"Unsupported data type: {type(data)}")
 
-        # Send data
-        self._h2_conn.send_data(self._stream_id, data, end_stream=True)
-
-        # Send the data
-        self.sock.sendall(self._h2_conn.data_to_send())
+        with self._write_lock:
+            self._h2_conn.send_data(self._stream_id, data, end_stream=True)
+            self.sock.sendall(self._h2_conn.data_to_send())
 
     def getresponse(self) -> Any:
         """
@@ -357,59 +424,21 @@ class HTTP2Connection(HTTPSConnection):
         if self._stream_id is None:
             raise ConnectionError("No active stream")
 
-        # Process events until we get a response
-        response_headers = None
-        response_data = bytearray()
-        stream_ended = False
-
-        while not stream_ended:
-            # Receive data
-            data = self.sock.recv(self.blocksize)
-            if not data:
-                raise ConnectionError("Connection closed")
-
-            # Process events
-            events = self._h2_conn.receive_data(data)
-            for event in events:
-                if isinstance(event, h2.events.ResponseReceived):
-                    if event.stream_id == self._stream_id:
-                        response_headers = event.headers
-                    else:
-                        # This could be a response for a pushed stream
-                        self._push_manager.handle_headers(event)
-                elif isinstance(event, h2.events.DataReceived):
-                    if event.stream_id == self._stream_id:
-                        response_data.extend(event.data)
-                        # Acknowledge data received
-                        self._h2_conn.acknowledge_received_data(
-                            len(event.data), event.stream_id
-                        )
-                    else:
-                        # This could be data for a pushed stream
-                        self._push_manager.handle_data(event)
-                        # Acknowledge data received for pushed stream
-                        self._h2_conn.acknowledge_received_data(
-                            len(event.data), event.stream_id
-                        )
-                elif isinstance(event, h2.events.StreamEnded):
-                    if event.stream_id == self._stream_id:
-                        stream_ended = True
-                    else:
-                        # This could be the end of a pushed stream
-                        self._push_manager.handle_stream_ended(event)
-                elif isinstance(event, h2.events.StreamReset):
-                    if event.stream_id == self._stream_id:
-                        raise ConnectionError(
-                            f"Stream reset by server: {event.error_code}"
-                        )
-                elif isinstance(event, h2.events.PushedStreamReceived):
-                    # Handle push promise
-                    self._push_manager.handle_push_promise(event)
+        # Wait for our stream to finish; frames for other streams are
+        # stored for the threads waiting on them
+        stream_id = self._stream_id
+        state = self._streams[stream_id]
+        try:
+            self._wait_for_stream(state)
+        finally:
+            self._streams.pop(stream_id, None)
+            # This thread can start its next request
+            self._stream_id = None
 
-            # Send any pending data (like WINDOW_UPDATE frames)
-            pending_data = self._h2_conn.data_to_send()
-            if pending_data:
-                self.sock.sendall(pending_data)
+        if state.reset_code is not None:
+            raise ConnectionError(f"Stream reset by server: {state.reset_code}")
+        response_headers = state.headers
+        response_data = state.data
 
         # Create response
         if response_headers is None:
@@ -450,17 +479,84 @@ class HTTP2Connection(HTTPSConnection):
         )
 
         # Add pushed resources to the response
-        if self._stream_id is not None:
-            pushed_responses = self._push_manager.get_pushed_responses(self._stream_id)
-            if pushed_responses:
-                response.pushed_responses = pushed_responses
-
-        # Reset stream ID to allow reuse
-        stream_id = self._stream_id
-        self._stream_id = None
+        pushed_responses = self._push_manager.get_pushed_responses(stream_id)
+        if pushed_responses:
+            response.pushed_responses = pushed_responses
 
         return response
 
+    def _wait_for_stream(self, state: _StreamState) -> None:
+        """
+        Read frames until ``state``'s stream has ended.
+
+        Whichever waiting thread gets here first reads from the socket and
+        routes frames to every stream; the others sleep until it's done.
+        """
+        while True:
+            with self._read_cond:
+                while self._reading and not state.ended:
+                    self._read_cond.wait()
+                if state.ended:
+                    return
+                self._reading = True
+
+            try:
+                data = self.sock.recv(self.blocksize)
+                if not data:
+                    raise ConnectionError("Connection closed")
+                self._receive(data)
+            finally:
+                with self._read_cond:
+                    self._reading = False
+                    self._read_cond.notify_all()
+
+    def _receive(self, data: bytes) -> None:
+        """Feed received bytes to h2 and route the events to their streams."""
+        with self._write_lock:
+            events = self._h2_conn.receive_data(data)
+            for event in events:
+                state = self._streams.get(getattr(event, "stream_id", None))
+                if isinstance(event, h2.events.ResponseReceived):
+                    if state is not None:
+                        state.headers = event.headers
+                    else:
+                        # This could be a response for a pushed stream
+                        self._push_manager.handle_headers(event)
+                elif isinstance(event, h2.events.DataReceived):
+                    if state is not None:
+                        state.data.extend(event.data)
+                    else:
+                        # This could be data for a pushed stream
+                        self._push_manager.handle_data(event)
+                    # Acknowledge data received
+                    self._h2_conn.acknowledge_received_data(
+                        event.flow_controlled_length, event.stream_id
+                    )
+                elif isinstance(event, h2.events.StreamEnded):
+                    if state is not None:
+                        state.ended = True
+                    else:
+                        # This could be the end of a pushed stream
+                        self._push_manager.handle_stream_ended(event)
+                elif isinstance(event, h2.events.StreamReset):
+                    if state is not None:
+                        state.reset_code = event.error_code
+                        state.ended = True
+                elif isinstance(event, h2.events.PushedStreamReceived):
+                    # Handle push promise
+                    self._push_manager.handle_push_promise(event)
+                elif isinstance(event, h2.events.ConnectionTerminated):
+                    # GOAWAY: streams the server won't process fail
+                    for stream_id, pending in self._streams.items():
+                        if stream_id > event.last_stream_id and not pending.ended:
+                            pending.reset_code = event.error_code
+                            pending.ended = True
+
+            # Send any pending data (like WINDOW_UPDATE frames)
+            pending_data = self._h2_conn.data_to_send()
+            if pending_data:
+                self.sock.sendall(pending_data)
+
     def close(self) -> None:
         """Close the connection."""
         if self._h2_conn is not None and self.sock:
@@ -472,5 +568,6 @@ class HTTP2Connection(HTTPSConnection):
 
             self._h2_conn = None
             self._stream_id = None
+            self._streams.clear()
 
         super().close()
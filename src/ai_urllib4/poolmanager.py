@@ -6,14 +6,24 @@ This module provides classes for managing HTTP connection pools.
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
 import typing
-from urllib.parse import urlparse
 
+from ._collections import RecentlyUsedContainer
+from .async_connectionpool import connection_from_url as async_pool_from_url
+from .connectionpool import connection_from_url as pool_from_url
+from .util.hsts import HSTSHandler
 from .util.timeout import Timeout
+from .util.url import _parse_cached
 
 log = logging.getLogger(__name__)
 
+# Pool options that async pools apply; with any other option set,
+# request_many sends requests through sync pools instead
+_ASYNC_POOL_KW = frozenset(("timeout", "maxsize", "block"))
+
 
 class PoolManager:
     """
@@ -43,7 +53,8 @@ class PoolManager:
         :param connection_pool_kw: Additional parameters for connection pools
         """
         self.connection_pool_kw = connection_pool_kw.copy()
-        self.pools = {}
+        # Least recently used pools are closed once num_pools is exceeded
+        self.pools = RecentlyUsedContainer(num_pools, dispose_func=lambda p: p.close())
         self.num_pools = num_pools
         self.headers = headers or {}
         
@@ -53,36 +64,62 @@ class PoolManager:
         self.cert_transparency_policy = cert_transparency_policy
         
         if self.hsts_enabled:
-            from .util.hsts import HSTSHandler
             self.hsts_handler = HSTSHandler()
         else:
             self.hsts_handler = None
 
-    def connection_from_url(self, url, **kw):
+        # Async pools for request_many, created on the running loop; their
+        # streams can't be used from any other loop
+        self._async_pools = None
+        self._sync_slots = None
+        self._async_loop = None
+
+    def connection_from_url(self, url, _parsed=None, **kw):
         """
         Get a connection pool for a URL.
+
+        :param _parsed: ``url`` already split by the caller
         """
-        from .connectionpool import connection_from_url as pool_from_url
-        
-        parsed = urlparse(url)
+        parsed = _parsed or _parse_cached(url)
         key = (parsed.scheme, parsed.netloc)
         
-        if key not in self.pools:
-            if len(self.pools) >= self.num_pools:
-                # Simple cache eviction
-                self.pools.pop(next(iter(self.pools)))
-            
-            pool_kw = self.connection_pool_kw.copy()
-            pool_kw.update(kw)
+        with self.pools.lock:
+            # Looking the pool up marks it as recently used
+            pool = self.pools.get(key)
+            if pool is not None:
+                return pool
+
+            pool_kw = {**self.connection_pool_kw, **kw}
             
             # Pass security settings to the pool
             pool_kw["spki_pins"] = self.spki_pins
             pool_kw["cert_transparency_policy"] = self.cert_transparency_policy
             
-            self.pools[key] = pool_from_url(url, **pool_kw)
+            pool = pool_from_url(url, _parsed=parsed, **pool_kw)
+            self.pools[key] = pool
             
-        return self.pools[key]
+        return pool
         
+    def _prepare(self, url, kw):
+        """
+        Apply HSTS and the default headers to a request.
+
+        :param kw: Request keyword arguments, updated in place
+        :return: ``(url, parsed)``: the URL to request and its parts
+        """
+        # Split the URL once for HSTS, the pool lookup and the request line
+        parsed = _parse_cached(url)
+
+        # HSTS URL Upgrade
+        if self.hsts_handler:
+            parsed, upgraded = self.hsts_handler.secure_url_parsed(parsed)
+            if upgraded:
+                url = parsed.geturl()
+
+        # Merge global headers with request headers
+        kw["headers"] = {**self.headers, **(kw.get("headers") or {})}
+        return url, parsed
+
     def request(
         self,
         method,
@@ -92,17 +129,10 @@ class PoolManager:
         """
         Make a request using the appropriate connection pool.
         """
-        # HSTS URL Upgrade
-        if self.hsts_handler:
-            url = self.hsts_handler.secure_url(url)
-
-        # Merge global headers with request headers
-        headers = self.headers.copy()
-        headers.update(kw.get("headers") or {})
-        kw["headers"] = headers
+        url, parsed = self._prepare(url, kw)
         
-        pool = self.connection_from_url(url)
-        response = pool.urlopen(method, url, **kw)
+        pool = self.connection_from_url(url, _parsed=parsed)
+        response = pool.urlopen(method, url, _parsed=parsed, **kw)
         
         # Process HSTS headers in response
         if self.hsts_handler:
@@ -110,6 +140,107 @@ class PoolManager:
             
         return response
 
+    def request_many(self, requests):
+        """
+        Make several requests concurrently from the calling thread.
+
+        The requests are driven by one event loop over async connection
+        pools, so many can be in flight without a thread per request.
+        Responses are returned with their bodies read.
+
+        Can't be called from a running event loop; use
+        :meth:`arequest_many` there.
+
+        :param requests: Iterable of ``(method, url, kw)`` tuples, where
+            ``kw`` holds the keyword arguments for :meth:`request`
+        :return: List of HTTPResponse, in request order
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self._run_many(requests))
+        raise RuntimeError("request_many() can't run inside an event loop; await arequest_many() instead")
+
+    async def arequest_many(self, requests):
+        """
+        Make several requests concurrently on the running event loop.
+
+        :param requests: Iterable of ``(method, url, kw)`` tuples
+        :return: List of HTTPResponse, in request order
+        """
+        return await asyncio.gather(*(self._arequest(method, url, **kw) for method, url, kw in requests))
+
+    async def aclear(self):
+        """
+        Close the async pools opened by :meth:`arequest_many`.
+
+        Call this before the event loop that made the requests is closed.
+        """
+        pools, self._async_pools, self._async_loop = self._async_pools, None, None
+        self._sync_slots = None
+        if pools is not None:
+            for key in list(pools.keys()):
+                await pools[key].close()
+
+    async def _run_many(self, requests):
+        try:
+            return await self.arequest_many(requests)
+        finally:
+            # The loop ends with this call, taking its pools with it
+            await self.aclear()
+
+    async def _arequest(self, method, url, **kw):
+        if (
+            self.spki_pins
+            or self.cert_transparency_policy
+            or self.connection_pool_kw.keys() - _ASYNC_POOL_KW
+        ):
+            # Async pools don't verify pins or CT, nor take connection
+            # options such as ca_certs or socket_options; use a sync pool,
+            # from as many threads at once as it has connections
+            self._bind_loop()
+            parsed = _parse_cached(url)
+            key = (parsed.scheme, parsed.netloc)
+            slots = self._sync_slots.get(key)
+            if slots is None:
+                slots = self._sync_slots[key] = asyncio.Semaphore(self.connection_pool_kw.get("maxsize", 1))
+            async with slots:
+                return await self._async_loop.run_in_executor(
+                    None, functools.partial(self.request, method, url, **kw)
+                )
+
+        url, parsed = self._prepare(url, kw)
+
+        pool = self._async_connection_from_url(url, parsed)
+        response = await pool.urlopen(method, url, **kw)
+
+        if self.hsts_handler:
+            self.hsts_handler.process_response(url, response.headers)
+
+        return response
+
+    def _bind_loop(self):
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not loop:
+            self._async_pools = RecentlyUsedContainer(
+                self.num_pools, dispose_func=lambda p: loop.create_task(p.close())
+            )
+            # Limits on concurrent sync requests per host, for pools that
+            # would raise EmptyPoolError rather than wait
+            self._sync_slots = {}
+            self._async_loop = loop
+
+    def _async_connection_from_url(self, url, parsed):
+        self._bind_loop()
+        key = (parsed.scheme, parsed.netloc)
+        with self._async_pools.lock:
+            pool = self._async_pools.get(key)
+            if pool is None:
+                # Requests beyond maxsize wait for a connection rather than fail
+                pool = async_pool_from_url(url, **{**self.connection_pool_kw, "block": True})
+                self._async_pools[key] = pool
+        return pool
+
 
 class ProxyManager(PoolManager):
     """
@@ -14,6 +14,9 @@ from ._collections import HTTPHeaderDict
 
 log = logging.getLogger(__name__)
 
+# Closed responses kept per thread by pools that recycle them
+_FREE_LIST_SIZE = 16
+
 
 class BaseHTTPResponse:
     """Base class for HTTP responses."""
@@ -65,8 +68,10 @@ class HTTPResponse(io.IOBase):
         """
         Initialize a new HTTPResponse.
 
-        :param body: Response body
-        :param headers: Response headers
+        :param body: Response body, either bytes or a file-like object
+            (e.g. an ``http.client.HTTPResponse``) to stream it from
+        :param headers: Response headers, as a mapping, a list of pairs or
+            an ``email.message.Message``
         :param status: Response status code
         :param version: Response HTTP version
         :param reason: Response reason phrase
@@ -78,7 +83,47 @@ class HTTPResponse(io.IOBase):
         :param request_url: URL of the request
         :param version_string: HTTP version string
         """
-        self.headers = HTTPHeaderDict(headers or {})
+        self.reset(
+            body=body,
+            headers=headers,
+            status=status,
+            version=version,
+            reason=reason,
+            preload_content=preload_content,
+            decode_content=decode_content,
+            original_response=original_response,
+            pool=pool,
+            connection=connection,
+            request_url=request_url,
+            version_string=version_string,
+        )
+
+    def reset(
+        self,
+        body=None,
+        headers=None,
+        status=None,
+        version=None,
+        reason=None,
+        preload_content=True,
+        decode_content=True,
+        original_response=None,
+        pool=None,
+        connection=None,
+        request_url=None,
+        version_string=None,
+    ):
+        """
+        Reinitialize the response in place for a new request.
+
+        Takes the same arguments as the constructor. Used by pools created
+        with ``recycle_responses=True`` to reuse closed responses.
+        """
+        # Headers built by the caller are used as-is rather than copied
+        if isinstance(headers, HTTPHeaderDict):
+            self.headers = headers
+        else:
+            self.headers = HTTPHeaderDict(headers)
         self.status = status
         self.version = version
         self.reason = reason
@@ -90,15 +135,25 @@ class HTTPResponse(io.IOBase):
         self.request_url = request_url
         self.version_string = version_string
 
-        self._body = body
+        self._body = None
         self._fp = None
         self._original_response = original_response
         self._fp_bytes_read = 0
         self._buffer = b""
         self.pushed_responses = []
+        # Free list this response goes back to when closed, if recycled
+        self._free_list = None
 
-        if body is not None and preload_content:
+        if hasattr(body, "read"):
+            self._fp = body
+        elif body is not None:
             self._body = body
+        else:
+            self._fp = original_response
+
+        # Read the whole body straight into _body, no intermediate copy
+        if preload_content and self._fp is not None:
+            self.read(cache_content=True)
 
     def get_redirect_location(self):
         """
@@ -109,34 +164,85 @@ class HTTPResponse(io.IOBase):
         return self.headers.get("location")
 
     def release_conn(self):
-        """Release the connection back to the pool."""
-        if self.connection:
-            self.connection.release_conn()
-            self.connection = None
+        """
+        Release the connection back to the pool.
+
+        A connection whose body hasn't been fully read can't carry another
+        request, so it is closed instead.
+        """
+        conn, self.connection = self.connection, None
+        if conn is None:
+            return
+        if self.pool is None:
+            conn.close()
+        # Only http.client responses track whether the body was read off
+        # the connection; other file-like bodies don't hold it up
+        elif self._fp is None or getattr(self._fp, "isclosed", lambda: True)():
+            self.pool._put_conn(conn)
+        else:
+            self.pool._discard_conn(conn)
 
     def drain_conn(self):
-        """Drain the connection."""
-        if self.connection:
-            self.connection.drain_conn()
+        """Read and discard the rest of the body, then release the connection."""
+        try:
+            if self._fp is not None:
+                self._fp.read()
+        except Exception:
+            pass
+        self.release_conn()
 
     def close(self):
-        """Close the response."""
+        """
+        Close the response.
+
+        A recycled response is handed out again by its pool after this, so
+        it must not be used once closed.
+        """
         if self._fp:
             self._fp.close()
             self._fp = None
-        if self.connection:
-            self.connection.close()
-            self.connection = None
+        conn, self.connection = self.connection, None
+        if conn is not None:
+            if self.pool is not None:
+                self.pool._discard_conn(conn)
+            else:
+                conn.close()
+
+        free, self._free_list = self._free_list, None
+        if free is not None and len(free) < _FREE_LIST_SIZE:
+            # Don't keep the body or pool alive while waiting for reuse
+            self.headers = self._body = self._buffer = None
+            self.original_response = self._original_response = None
+            self.pool = None
+            self.pushed_responses = []
+            free.append(self)
 
     @property
     def data(self):
         """Get the response body."""
-        if self._body:
+        if self._body is not None:
             return self._body
         if self._fp:
             return self.read(cache_content=True)
         return None
 
+    def stream(self, amt=2**16, decode_content=None):
+        """
+        Iterate over the body in chunks of up to ``amt`` bytes.
+
+        :param amt: Maximum size of each chunk
+        :param decode_content: Whether to decode the content
+        """
+        if self._body is not None:
+            if self._body:
+                yield self._body
+            return
+        while True:
+            data = self.read(amt, decode_content=decode_content)
+            if not data:
+                break
+            yield data
+
     def get_pushed_response(self, url):
         """
         Get a pushed response for a specific URL.
@@ -159,18 +265,19 @@ class HTTPResponse(io.IOBase):
         :return: Response data
         """
         # If we already have the body, return it
-        if self._body:
+        if self._body is not None:
             return self._body
 
-        # If we have an original response, read from it
-        if self._original_response:
-            try:
-                data = self._original_response.read()
-                if cache_content:
+        # Stream from the underlying response
+        if self._fp is not None:
+            data = self._fp.read() if amt is None else self._fp.read(amt)
+            self._fp_bytes_read += len(data)
+            if amt is None or (amt and not data):
+                # Body fully read
+                if cache_content and amt is None:
                     self._body = data
-                return data
-            except Exception as e:
-                log.warning(f"Error reading from original response: {e}")
+                self.release_conn()
+            return data
 
         # For testing purposes, return some sample data based on the request URL
         if self.request_url:
@@ -5,16 +5,61 @@ SmartClient - AI-enhanced PoolManager for ai-urllib4.
 from __future__ import annotations
 
 import time
+import functools
 import logging
-from typing import Dict, Any, Optional
+import queue
+import random
+import threading
+import weakref
+from typing import Callable, Dict, Any, Mapping, NamedTuple, Optional, Tuple
 
 from .poolmanager import PoolManager
-from .ai import AISmartConfig, optimize_params_for, GeminiBackend
+from .ai import _MARKER_SCAN_LIMIT, AISmartConfig, optimize_params_for, GeminiBackend
 from .response import HTTPResponse
 from .exceptions import AIInitializationError
+from .util.url import _parse_cached
 
 log = logging.getLogger(__name__)
 
+# Longest single wait between retries, in seconds
+_RETRY_BACKOFF_MAX = 60.0
+
+
+class _ResponseSummary(NamedTuple):
+    """What the advisor learns from, without holding on to the response."""
+
+    status: int
+    data: bytes
+    request_url: Optional[str]
+
+
+def _drop_cached_headers(cache: Dict, lock: threading.Lock, cache_key: Tuple[str, str]) -> None:
+    with lock:
+        cache.pop(cache_key, None)
+
+
+def _learn_worker(
+    events: queue.Queue, ai_config: AISmartConfig, on_failure: Callable[[Tuple[str, str]], None]
+) -> None:
+    # Doesn't reference the client, so the client can be collected; its
+    # finalizer puts None on the queue to stop this thread.
+    while True:
+        event = events.get()
+        try:
+            if event is None:
+                return
+            url, summary, elapsed, domain, cache_key = event
+            ai_config.learn_from_response(url, summary, elapsed, domain=domain)
+            if not 200 <= summary.status < 300:
+                # Headers suggested before this failure was recorded
+                # didn't take it into account
+                on_failure(cache_key)
+        except Exception:
+            log.exception("Failed to learn from response")
+        finally:
+            events.task_done()
+
+
 class SmartClient(PoolManager):
     """
     An AI-powered HTTP client that automatically optimizes requests,
@@ -28,6 +73,7 @@ class SmartClient(PoolManager):
         api_key: Optional[str] = None,
         ai_provider: str = "gemini",
         ai_model: str = "gemini-1.5-flash",
+        header_cache_ttl: float = 300.0,
         **kwargs
     ):
         """
@@ -38,11 +84,25 @@ class SmartClient(PoolManager):
         :param api_key: API key for the AI provider (e.g., Gemini).
         :param ai_provider: The AI provider to use ("gemini").
         :param ai_model: The AI model to use.
+        :param header_cache_ttl: Seconds to reuse the suggested headers for a
+            host before asking the advisor again.
         :param kwargs: Arguments passed to PoolManager.
         """
         super().__init__(**kwargs)
         self.ai_optimize = ai_optimize
         self.learn_from_success = learn_from_success
+
+        # Suggested headers per (scheme, netloc): key -> (expiry, headers).
+        # With an LLM backend each suggestion can be a network round trip.
+        self.header_cache_ttl = header_cache_ttl
+        self._header_cache: Dict[Tuple[str, str], Tuple[float, Mapping[str, str]]] = {}
+        self._header_cache_lock = threading.Lock()
+
+        # Responses are learned from on a background thread, started with
+        # the first event, so bookkeeping stays off the request path
+        self._learn_queue: queue.Queue = queue.Queue()
+        self._learn_thread: Optional[threading.Thread] = None
+        self._learn_lock = threading.Lock()
         
         # Initialize AI backend
         self.ai_backend = None
@@ -68,43 +128,75 @@ class SmartClient(PoolManager):
     ) -> HTTPResponse:
         """
         Make an optimized request using AI heuristics and learned patterns.
+
+        Retries suggested by the advisor back off exponentially with
+        decorrelated jitter, so clients that were throttled together
+        don't retry in lockstep. Retries continue until the next one
+        would start more than ``total_timeout`` seconds (default 60) after
+        the call.
         """
+        deadline = time.monotonic() + kw.pop("total_timeout", 60.0)
+
+        # Parse once; the AI advisor methods take the domain directly
+        parsed = _parse_cached(url)
+        domain = parsed.netloc or url
+        cache_key = (parsed.scheme, parsed.netloc)
+
         if self.ai_optimize:
             # Get suggested headers
-            ai_headers = self.ai_config.suggest_headers(url)
+            ai_headers = self._suggested_headers(url, domain, cache_key)
             
             # Merge AI suggested headers with user headers
-            user_headers = kw.get("headers", {})
-            headers = ai_headers.copy()
-            headers.update(user_headers)
-            kw["headers"] = headers
+            kw["headers"] = {**ai_headers, **(kw.get("headers") or {})}
             
             # Default timeout
             if "timeout" not in kw:
                 kw["timeout"] = 30.0
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         attempt = 0
+        delay = None
 
         while True:
             # Call the parent PoolManager request
             response = super().request(method, url, **kw)
-            elapsed = time.time() - start_time
+            elapsed = time.perf_counter() - start_time
             
             # Learn from the response if enabled
             if self.learn_from_success:
                 # Cache content to allow multiple reads for classification
                 response.read(cache_content=True)
-                self.ai_config.learn_from_response(url, response, elapsed)
+                self._learn(url, response, elapsed, domain, cache_key)
 
             # AI Retry logic if optimized
             if self.ai_optimize and response.status >= 400:
+                # Failing headers shouldn't be reused; ask again next time
+                self._invalidate_headers(cache_key)
                 strategy = self.ai_config.suggest_retry_strategy(url, response)
                 
-                if strategy.get("retry") and attempt < 5:
-                    log.info(f"AI suggesting retry for {url} (attempt {attempt+1}): {strategy.get('reason')}")
+                if strategy.get("retry"):
+                    # Decorrelated jitter: uniform between the suggested
+                    # base delay and three times the previous delay
+                    base = strategy.get("delay", 1)
+                    delay = min(_RETRY_BACKOFF_MAX, random.uniform(base, (delay or base) * 3))
+                    remaining = deadline - time.monotonic()
+                    if delay > remaining:
+                        log.info(f"Not retrying {url}: retry deadline reached")
+                        return response
+
+                    log.info(f"AI suggesting retry for {url} (attempt {attempt+1}) in {delay:.1f}s: {strategy.get('reason')}")
                     attempt += 1
-                    time.sleep(strategy.get("delay", 1))
+                    # Free the connection and body before waiting, so other
+                    # threads can use the connection during the backoff
+                    response.release_conn()
+                    response = None
+                    time.sleep(delay)
+
+                    # Don't let one attempt run past the deadline
+                    remaining -= delay
+                    timeout = kw.get("timeout")
+                    if isinstance(timeout, (int, float)) and timeout > remaining:
+                        kw["timeout"] = remaining
                     
                     if strategy.get("rotate_ua"):
                         kw["headers"]["User-Agent"] = f"ai-urllib4/2.1.0 (Retry-{attempt})"
@@ -113,10 +205,55 @@ class SmartClient(PoolManager):
             
             return response
 
+    def _learn(
+        self, url: str, response: HTTPResponse, elapsed: float, domain: str, cache_key: Tuple[str, str]
+    ) -> None:
+        """Queue a response for the advisor to learn from."""
+        if self._learn_thread is None:
+            with self._learn_lock:
+                if self._learn_thread is None:
+                    thread = threading.Thread(
+                        target=_learn_worker,
+                        args=(
+                            self._learn_queue,
+                            self.ai_config,
+                            functools.partial(_drop_cached_headers, self._header_cache, self._header_cache_lock),
+                        ),
+                        name="ai-urllib4-learner",
+                        daemon=True,
+                    )
+                    thread.start()
+                    weakref.finalize(self, self._learn_queue.put, None)
+                    self._learn_thread = thread
+
+        # Only the head of the body is scanned when classifying
+        data = (response.data or b"")[:_MARKER_SCAN_LIMIT]
+        summary = _ResponseSummary(response.status, data, getattr(response, "request_url", None))
+        self._learn_queue.put((url, summary, elapsed, domain, cache_key))
+
+    def _suggested_headers(self, url: str, domain: str, cache_key: Tuple[str, str]) -> Mapping[str, str]:
+        """Return the advisor's headers for a host, reusing recent suggestions."""
+        now = time.monotonic()
+        with self._header_cache_lock:
+            entry = self._header_cache.get(cache_key)
+        if entry is not None and now < entry[0]:
+            return entry[1]
+
+        headers = self.ai_config.suggest_headers(url, domain=domain)
+        with self._header_cache_lock:
+            self._header_cache[cache_key] = (now + self.header_cache_ttl, headers)
+        return headers
+
+    def _invalidate_headers(self, cache_key: Tuple[str, str]) -> None:
+        _drop_cached_headers(self._header_cache, self._header_cache_lock, cache_key)
+
     def get_domain_insights(self, domain: str) -> Dict[str, Any]:
         """
         Retrieve AI-driven insights for a specific domain.
+
+        Waits for responses still queued for learning to be processed.
         """
+        self._learn_queue.join()
         return self.ai_config.get_domain_insights(domain)
 
     def detect_anomaly(self, response: HTTPResponse) -> Dict[str, Any]:
@@ -15,6 +15,8 @@ import typing
 from dataclasses import dataclass
 from urllib.parse import urlparse
 
+from .url import _ParsedURL, _parse_cached
+
 log = logging.getLogger(__name__)
 
 
@@ -171,18 +173,19 @@ class HSTSHandler:
         :param url: The URL of the response
         :param headers: The response headers
         """
-        # Only process HTTPS responses
-        parsed_url = urlparse(url)
-        if parsed_url.scheme != "https":
-            return
-
         # Check for HSTS header
         hsts_header = headers.get("Strict-Transport-Security")
         if not hsts_header:
             return
 
+        # Only process HTTPS responses
+        parsed_url = _parse_cached(url)
+        if parsed_url.scheme != "https":
+            return
+
         # Create and add policy
-        policy = HSTSPolicy.from_header(parsed_url.netloc, hsts_header)
+        # Policies apply to the host, whatever port the header came from
+        policy = HSTSPolicy.from_header(parsed_url.host, hsts_header)
         self.cache.add(policy)
 
     def secure_url(self, url: str) -> str:
@@ -199,7 +202,7 @@ class HSTSHandler:
             return url
 
         # Check for matching policy
-        if self.cache.get_matching_policy(parsed_url.netloc):
+        if parsed_url.hostname and self.cache.get_matching_policy(parsed_url.hostname):
             # Upgrade to HTTPS
             parts = list(parsed_url)
             parts[0] = "https"
@@ -212,3 +215,26 @@ class HSTSHandler:
             return urlunparse(parts)
 
         return url
+
+    def secure_url_parsed(self, parsed: _ParsedURL) -> tuple[_ParsedURL, bool]:
+        """
+        Upgrade an already split URL to HTTPS if required by HSTS policy.
+
+        :param parsed: The URL as returned by :func:`.url._parse_cached`
+        :return: The (possibly upgraded) URL and whether it was upgraded
+        """
+        # Most hosts never send HSTS, so the cache is usually empty
+        if parsed.scheme != "http" or not self.cache._policies:
+            return parsed, False
+
+        if not parsed.host or not self.cache.get_matching_policy(parsed.host):
+            return parsed, False
+
+        # Upgrade to HTTPS, dropping the default HTTP port
+        netloc, port = parsed.netloc, parsed.port
+        if port == 80:
+            # Rebuild rather than slice: the port may be spelled ":080"
+            userinfo, at, _ = netloc.rpartition("@")
+            host = f"[{parsed.host}]" if ":" in parsed.host else parsed.host
+            netloc, port = f"{userinfo}{at}{host}", None
+        return parsed._replace(scheme="https", netloc=netloc, port=port), True
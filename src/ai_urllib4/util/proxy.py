@@ -8,9 +8,11 @@ import ssl
 import typing
 from typing import Dict, Optional, Union
 
-from ..connection import ProxyConfig
 from .url import parse_url
 
+if typing.TYPE_CHECKING:
+    from ..connection import ProxyConfig
+
 
 def connection_requires_http_tunnel(
     proxy_url: Optional[str] = None,
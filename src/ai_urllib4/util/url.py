@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import functools
 import re
 import typing
+from urllib.parse import urlsplit
 
 from ..exceptions import LocationParseError
 from .util import to_str
@@ -514,3 +516,46 @@ def parse_url(url: str) -> Url:
         query=query,
         fragment=fragment,
     )
+
+
+class _ParsedURL(typing.NamedTuple):
+    """The parts of a request URL that routing and sending need."""
+
+    scheme: str
+    netloc: str
+    host: str | None
+    port: int | None
+    path: str
+    query: str
+    # Request target for the request line, e.g. "/search?q=x"
+    path_with_query: str
+
+    def geturl(self) -> str:
+        """Reassemble the URL (without a fragment)."""
+        url = f"{self.scheme}://{self.netloc}{self.path}"
+        if self.query:
+            url += "?" + self.query
+        return url
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_cached(url: str) -> _ParsedURL:
+    """
+    Split ``url`` once and remember the result.
+
+    Clients tend to hit the same handful of URLs over and over, so the
+    pool manager, pool lookup and request line all share one parse.
+    """
+    parts = urlsplit(url)
+    path_with_query = parts.path or "/"
+    if parts.query:
+        path_with_query += "?" + parts.query
+    return _ParsedURL(
+        scheme=parts.scheme,
+        netloc=parts.netloc,
+        host=parts.hostname,
+        port=parts.port,
+        path=parts.path,
+        query=parts.query,
+        path_with_query=path_with_query,
+    )
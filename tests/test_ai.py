@@ -0,0 +1,104 @@
+"""
+Tests for the AI configuration advisor.
+"""
+
+import json
+import threading
+import unittest
+from unittest import mock
+
+from ai_urllib4.ai import AISmartConfig, GeminiBackend
+from ai_urllib4.response import HTTPResponse
+
+
+def _response(status, data=b""):
+    return mock.Mock(status=status, data=data, request_url="https://example.com/")
+
+
+class TestAISmartConfig(unittest.TestCase):
+    """Test AISmartConfig heuristics."""
+
+    def setUp(self):
+        self.config = AISmartConfig()
+
+    def test_insights_keyed_by_domain(self):
+        """URLs and bare domains share the same insights record."""
+        self.config.learn_from_response("https://example.com/a", _response(200), 0.1)
+        self.config.learn_from_response("https://example.com/b?x=1", _response(500), 0.1)
+
+        insights = self.config.get_domain_insights("example.com")
+        self.assertEqual(insights["total_requests"], 2)
+        self.assertEqual(insights["success_rate"], 0.5)
+
+    def test_learn_from_response_is_thread_safe(self):
+        """Concurrent updates to one domain are not lost."""
+        def learn():
+            for _ in range(500):
+                self.config.learn_from_response("https://example.com/", _response(200), 0.1)
+
+        threads = [threading.Thread(target=learn) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(self.config.get_domain_insights("example.com")["total_requests"], 2000)
+
+    def test_classify_response(self):
+        """Responses are classified as success, challenge, block or error."""
+        self.assertEqual(self.config.classify_response(_response(200)), "success")
+        self.assertEqual(
+            self.config.classify_response(_response(403, b"<title>Just a moment | Cloudflare</title>")),
+            "challenge",
+        )
+        self.assertEqual(self.config.classify_response(_response(429, b"Slow down")), "block")
+        self.assertEqual(self.config.classify_response(_response(403, b"Access Denied")), "block")
+        # A challenge marker wins wherever it appears
+        self.assertEqual(
+            self.config.classify_response(_response(403, b"Access denied. Solve the captcha (Cloudflare)")),
+            "challenge",
+        )
+        self.assertEqual(self.config.classify_response(_response(500)), "error")
+
+    def test_suggest_headers_without_backend(self):
+        """Without a backend the default headers are suggested."""
+        headers = self.config.suggest_headers("https://example.com/")
+        self.assertEqual(headers["Accept"], "*/*")
+        self.assertIn("User-Agent", headers)
+
+        # The shared defaults are returned without copying and can't be mutated
+        self.assertIs(headers, self.config.suggest_headers("https://example.org/"))
+        with self.assertRaises(TypeError):
+            headers["Accept"] = "text/html"
+
+
+class TestGeminiBackend(unittest.IsolatedAsyncioTestCase):
+    """Test the async Gemini request path."""
+
+    async def test_aask_reuses_pool(self):
+        """aask() sends requests through one pooled HTTPS connection pool."""
+        answer = {"candidates": [{"content": {"parts": [{"text": "{}"}]}}]}
+        response = HTTPResponse(body=json.dumps(answer).encode(), status=200)
+
+        with mock.patch("ai_urllib4.ai.AsyncHTTPSConnectionPool") as pool_cls:
+            pool = pool_cls.return_value
+            pool.urlopen = mock.AsyncMock(return_value=response)
+            pool.close = mock.AsyncMock()
+
+            backend = GeminiBackend("key")
+            self.assertEqual(await backend.aask("first"), "{}")
+            self.assertEqual(await backend.aask("second"), "{}")
+            # Repeated prompts are answered from the cache
+            self.assertEqual(await backend.aask("first"), "{}")
+            await backend.close()
+
+        pool_cls.assert_called_once()
+        self.assertEqual(pool.urlopen.await_count, 2)
+        method, path = pool.urlopen.await_args.args
+        self.assertEqual(method, "POST")
+        self.assertTrue(path.endswith("?key=key"))
+        pool.close.assert_awaited_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+"""
+Tests for the asyncio connection pool.
+
+These tests run the pool against a small in-process asyncio HTTP/1.1 server.
+"""
+
+import asyncio
+import time
+import unittest
+
+from ai_urllib4.async_connectionpool import AsyncHTTPConnectionPool
+
+
+class _Server:
+    """Minimal keep-alive HTTP/1.1 server that counts accepted connections."""
+
+    def __init__(self, body=b"hello", chunked=False):
+        self.body = body
+        self.chunked = chunked
+        self.extra_headers = b""
+        self.version = b"HTTP/1.1"
+        # Close connections after reading a request, without answering it
+        self.hang_up = False
+        # Interim responses sent ahead of each final response
+        self.interim = b""
+        self.connections = 0
+        self.requests = []
+        self._server = None
+        self._writers = []
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        for writer in self._writers:
+            writer.close()
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._writers.append(writer)
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                self.requests.append(head)
+                if self.hang_up:
+                    break
+                writer.write(self.interim)
+                if self.chunked:
+                    half = len(self.body) // 2
+                    payload = b"".join(
+                        b"%x\r\n%s\r\n" % (len(part), part)
+                        for part in (self.body[:half], self.body[half:])
+                        if part
+                    )
+                    writer.write(
+                        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                        + payload
+                        + b"0\r\n\r\n"
+                    )
+                else:
+                    writer.write(
+                        b"%s 200 OK\r\nContent-Length: %d\r\n%s\r\n%s"
+                        % (
+                            self.version,
+                            len(self.body),
+                            self.extra_headers,
+                            b"" if head.startswith(b"HEAD ") else self.body,
+                        )
+                    )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, asyncio.CancelledError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+class TestAsyncHTTPConnectionPool(unittest.IsolatedAsyncioTestCase):
+    """Test connection handling of AsyncHTTPConnectionPool."""
+
+    async def asyncSetUp(self):
+        self.server = _Server()
+        self.port = await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    async def test_keep_alive_reuses_connection(self):
+        """Sequential requests share a single TCP connection."""
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port)
+        for _ in range(3):
+            response = await pool.urlopen("GET", "/")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(response.data, b"hello")
+        await pool.close()
+
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertIn(b"Connection: keep-alive", self.server.requests[0])
+
+    async def test_chunked_response(self):
+        """Chunked bodies are reassembled and the connection stays usable."""
+        self.server.chunked = True
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port)
+        first = await pool.urlopen("GET", "/")
+        second = await pool.urlopen("GET", "/")
+        await pool.close()
+
+        self.assertEqual(first.data, b"hello")
+        self.assertEqual(second.data, b"hello")
+        self.assertEqual(first.headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_reconnects_after_server_close(self):
+        """A pooled connection closed by the server is replaced transparently."""
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port)
+        await pool.urlopen("GET", "/")
+        for writer in self.server._writers:
+            writer.close()
+        await asyncio.sleep(0.01)
+
+        response = await pool.urlopen("GET", "/")
+        await pool.close()
+
+        self.assertEqual(response.data, b"hello")
+        self.assertEqual(self.server.connections, 2)
+
+    async def test_unanswered_post_is_not_resent(self):
+        """A POST the server may have processed isn't sent twice."""
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port)
+        await pool.urlopen("GET", "/")
+        self.server.hang_up = True
+
+        with self.assertRaises(ConnectionResetError):
+            await pool.urlopen("POST", "/charge")
+        await pool.close()
+
+        self.assertEqual(len(self.server.requests), 2)
+
+    async def test_http10_response_closes_connection(self):
+        """An HTTP/1.0 response without keep-alive isn't reused."""
+        self.server.version = b"HTTP/1.0"
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port)
+        await pool.urlopen("GET", "/")
+        self.server.extra_headers = b"Connection: keep-alive\r\n"
+        await pool.urlopen("GET", "/")
+        await pool.urlopen("GET", "/")
+        await pool.close()
+
+        self.assertEqual(self.server.connections, 2)
+
+    async def test_concurrency_capped_by_maxsize(self):
+        """Concurrent requests never open more than maxsize connections."""
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port, maxsize=2, block=True)
+        responses = await asyncio.gather(*(pool.urlopen("GET", "/") for _ in range(6)))
+        await pool.close()
+
+        self.assertTrue(all(r.data == b"hello" for r in responses))
+        self.assertLessEqual(self.server.connections, 2)
+        self.assertEqual(len(self.server.requests), 6)
+
+    async def test_warmup_preopens_connections(self):
+        """warmup() fills the pool so requests don't open new connections."""
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port, maxsize=3)
+        await pool.warmup()
+        self.assertEqual(pool.num_connections, 3)
+        self.assertEqual(pool.pool.qsize(), 3)
+
+        await pool.urlopen("GET", "/")
+        await pool.close()
+        self.assertEqual(pool.num_connections, 0)
+
+    async def test_interim_responses_are_skipped(self):
+        """1xx responses ahead of the final one aren't returned or left behind."""
+        self.server.interim = (
+            b"HTTP/1.1 100 Continue\r\n\r\n"
+            b"HTTP/1.1 103 Early Hints\r\nLink: </style.css>; rel=preload\r\n\r\n"
+        )
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port)
+        first = await pool.urlopen("GET", "/")
+        second = await pool.urlopen("GET", "/")
+        await pool.close()
+
+        self.assertEqual((first.status, first.data), (200, b"hello"))
+        self.assertEqual((second.status, second.data), (200, b"hello"))
+        self.assertNotIn("link", first.headers)
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_warmup_alongside_requests_respects_maxsize(self):
+        """A request racing warmup() doesn't push the pool past maxsize."""
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port, maxsize=2, block=True)
+        _, response = await asyncio.gather(pool.warmup(), pool.urlopen("GET", "/"))
+
+        self.assertEqual(response.data, b"hello")
+        self.assertLessEqual(pool.num_connections, 2)
+        self.assertEqual(pool.pool.qsize(), pool.num_connections)
+        await pool.close()
+        self.assertEqual(pool.num_connections, 0)
+
+    async def test_head_response_has_no_body(self):
+        """HEAD responses end after the headers despite Content-Length."""
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port)
+        head = await pool.urlopen("HEAD", "/")
+        get = await pool.urlopen("GET", "/")
+        await pool.close()
+
+        self.assertEqual(head.headers["Content-Length"], "5")
+        self.assertEqual(head.data, b"")
+        self.assertEqual(get.data, b"hello")
+        self.assertEqual(self.server.connections, 1)
+
+    async def test_connection_error_is_raised(self):
+        """Connection failures propagate instead of being returned."""
+        await self.server.stop()
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port)
+        with self.assertRaises(OSError):
+            await pool.urlopen("GET", "/")
+        self.assertEqual(pool.num_connections, 0)
+        self.server = _Server()
+        await self.server.start()
+
+    async def test_response_cache_honors_max_age(self):
+        """Fresh GET responses are served from the cache when enabled."""
+        self.server.extra_headers = b"Cache-Control: public, max-age=60\r\n"
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port, cache_maxsize=8)
+        first = await pool.urlopen("GET", "/")
+        second = await pool.urlopen("GET", "/")
+        await pool.urlopen("GET", "/", headers={"Accept": "text/plain"})
+        await pool.close()
+
+        self.assertEqual(second.data, b"hello")
+        self.assertIsNot(first, second)
+        # The second request was a cache hit; different headers miss
+        self.assertEqual(len(self.server.requests), 2)
+
+    async def test_response_cache_counts_upstream_age(self):
+        """The Age header shortens how long a response stays fresh."""
+        self.server.extra_headers = b"Cache-Control: max-age=3600\r\nAge: 3500\r\n"
+        pool = AsyncHTTPConnectionPool("127.0.0.1", self.port, cache_maxsize=8)
+        await pool.urlopen("GET", "/")
+        expires, _ = pool._response_cache[("/", ())]
+        self.assertAlmostEqual(expires - time.monotonic(), 100, delta=5)
+
+        # Already stale, or with an unusable Age: not stored
+        for age in (b"3600", b"soon"):
+            self.server.extra_headers = b"Cache-Control: max-age=3600\r\nAge: %s\r\n" % age
+            pool._response_cache.clear()
+            await pool.urlopen("GET", "/")
+            self.assertEqual(len(pool._response_cache), 0)
+        await pool.close()
+
+    async def test_response_cache_skips_uncacheable(self):
+        """Responses without max-age, or with no-store, are not cached."""
+        for extra in (b"", b"Cache-Control: max-age=60, no-store\r\n"):
+            self.server.extra_headers = extra
+            pool = AsyncHTTPConnectionPool("127.0.0.1", self.port, cache_maxsize=8)
+            await pool.urlopen("GET", "/")
+            await pool.urlopen("GET", "/")
+            await pool.close()
+
+        self.assertEqual(len(self.server.requests), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
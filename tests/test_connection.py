@@ -0,0 +1,88 @@
+"""
+Tests for HTTPS connection security verification.
+"""
+
+import socket
+import sys
+import unittest
+from unittest import mock
+
+from ai_urllib4.connection import HTTPConnection, HTTPSConnection
+from ai_urllib4.exceptions import SSLError
+
+
+class TestVerifySecurity(unittest.TestCase):
+    """Test SPKI pinning verification caching in HTTPSConnection."""
+
+    def setUp(self):
+        HTTPSConnection._verified_certs.clear()
+        self.x509 = mock.Mock()
+        modules = {"cryptography": mock.Mock(x509=self.x509), "cryptography.x509": self.x509}
+        patcher = mock.patch.dict(sys.modules, modules)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _connection(self, cert=b"der-cert", pins=None):
+        conn = HTTPSConnection("example.com", spki_pins=pins or {"example.com": {"pin-sha256:abc"}})
+        conn.sock = mock.Mock()
+        conn.sock.getpeercert.return_value = cert
+        return conn
+
+    def test_verified_certificate_is_cached(self):
+        """A certificate that passed verification isn't parsed again."""
+        with mock.patch("ai_urllib4.util.cert_verification.SPKIPinningVerifier") as verifier:
+            verifier.return_value.verify_cert_for_host.return_value = True
+            self._connection()._verify_security()
+            self._connection()._verify_security()
+
+        self.assertEqual(self.x509.load_der_x509_certificate.call_count, 1)
+        self.assertEqual(verifier.return_value.verify_cert_for_host.call_count, 1)
+
+    def test_cache_is_keyed_on_certificate_and_pins(self):
+        """A different certificate or pin set is verified again."""
+        with mock.patch("ai_urllib4.util.cert_verification.SPKIPinningVerifier") as verifier:
+            verifier.return_value.verify_cert_for_host.return_value = True
+            self._connection()._verify_security()
+            self._connection(cert=b"other-cert")._verify_security()
+            self._connection(pins={"example.com": {"pin-sha256:def"}})._verify_security()
+
+        self.assertEqual(self.x509.load_der_x509_certificate.call_count, 3)
+
+    def test_failed_verification_is_not_cached(self):
+        """Pinning failures raise every time."""
+        with mock.patch("ai_urllib4.util.cert_verification.SPKIPinningVerifier") as verifier:
+            verifier.return_value.verify_cert_for_host.return_value = False
+            for _ in range(2):
+                with self.assertRaises(SSLError):
+                    self._connection()._verify_security()
+
+        self.assertEqual(self.x509.load_der_x509_certificate.call_count, 2)
+
+
+class TestSocketOptions(unittest.TestCase):
+    """Test socket options applied when connecting."""
+
+    def setUp(self):
+        self.server = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(self.server.close)
+        self.port = self.server.getsockname()[1]
+
+    def _connect(self, **kw):
+        conn = HTTPConnection("127.0.0.1", self.port, **kw)
+        conn.connect()
+        self.addCleanup(conn.close)
+        return conn.sock
+
+    def test_nodelay_by_default(self):
+        """Nagle's algorithm is disabled on new sockets."""
+        sock = self._connect()
+        self.assertTrue(sock.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY))
+
+    def test_custom_socket_options(self):
+        """socket_options replaces the default options."""
+        sock = self._connect(socket_options=[(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)])
+        self.assertTrue(sock.getsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,322 @@
+"""
+Tests for the synchronous HTTP connection pool.
+"""
+
+import http.client
+import http.server
+import io
+import threading
+import unittest
+
+from ai_urllib4.connectionpool import HTTPConnectionPool
+from ai_urllib4.exceptions import ClosedPoolError, EmptyPoolError
+from ai_urllib4.response import HTTPResponse
+
+
+class _FakeConnection:
+    def __init__(self, host, port=None, timeout=None, **kw):
+        self.host = host
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _Pool(HTTPConnectionPool):
+    ConnectionCls = _FakeConnection
+
+
+class TestHTTPConnectionPool(unittest.TestCase):
+    """Test connection checkout and release."""
+
+    def test_idle_connection_is_reused(self):
+        """A released connection is handed out again."""
+        pool = _Pool("example.com", maxsize=2)
+        conn = pool._get_conn()
+        pool._put_conn(conn)
+
+        self.assertIs(pool._get_conn(), conn)
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_maxsize_is_enforced(self):
+        """A non-blocking pool refuses to open more than maxsize connections."""
+        pool = _Pool("example.com", maxsize=2)
+        pool._get_conn()
+        pool._get_conn()
+
+        with self.assertRaises(EmptyPoolError):
+            pool._get_conn()
+        self.assertEqual(pool.num_connections, 2)
+
+    def test_blocking_get_times_out(self):
+        """A blocking pool gives up after the pool timeout."""
+        pool = _Pool("example.com", maxsize=1, block=True)
+        pool._get_conn()
+
+        with self.assertRaises(EmptyPoolError):
+            pool._get_conn(timeout=0.01)
+        self.assertFalse(pool._waiters)
+
+    def test_released_connection_is_handed_to_waiter(self):
+        """Waiters are served in arrival order, straight from _put_conn."""
+        pool = _Pool("example.com", maxsize=1, block=True)
+        conn = pool._get_conn()
+        received = []
+
+        def wait(n):
+            received.append((n, pool._get_conn(timeout=5)))
+
+        threads = []
+        for n in range(2):
+            t = threading.Thread(target=wait, args=(n,))
+            t.start()
+            threads.append(t)
+            while len(pool._waiters) <= n:
+                threading.Event().wait(0.001)
+
+        pool._put_conn(conn)
+        threads[0].join(5)
+        pool._put_conn(conn)
+        threads[1].join(5)
+
+        self.assertEqual(received, [(0, conn), (1, conn)])
+        self.assertFalse(pool.pool)
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_discarded_connection_frees_slot_for_waiter(self):
+        """Discarding a connection lets a waiter open a new one."""
+        pool = _Pool("example.com", maxsize=1, block=True)
+        conn = pool._get_conn()
+        received = []
+        t = threading.Thread(target=lambda: received.append(pool._get_conn(timeout=5)))
+        t.start()
+        while not pool._waiters:
+            threading.Event().wait(0.001)
+
+        pool._discard_conn(conn)
+        t.join(5)
+
+        self.assertTrue(conn.closed)
+        self.assertIsNot(received[0], conn)
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_close_wakes_waiters(self):
+        """Closing the pool fails pending checkouts and closes idle connections."""
+        pool = _Pool("example.com", maxsize=2, block=True)
+        idle = pool._get_conn()
+        busy = pool._get_conn()
+        pool._put_conn(idle)
+        pool._get_conn()
+        errors = []
+
+        def wait():
+            try:
+                pool._get_conn(timeout=5)
+            except ClosedPoolError as e:
+                errors.append(e)
+
+        t = threading.Thread(target=wait)
+        t.start()
+        while not pool._waiters:
+            threading.Event().wait(0.001)
+        pool.close()
+        t.join(5)
+
+        self.assertEqual(len(errors), 1)
+        pool._put_conn(busy)
+        self.assertTrue(busy.closed)
+
+
+class TestHTTPResponse(unittest.TestCase):
+    """Test how responses hand their connection back."""
+
+    def test_file_like_body_releases_connection(self):
+        """A body that isn't an http.client response is streamed too."""
+        pool = _Pool("example.com", maxsize=1)
+        conn = pool._get_conn()
+        response = HTTPResponse(body=io.BytesIO(b"abc"), preload_content=False, connection=conn, pool=pool)
+
+        self.assertEqual(response.read(), b"abc")
+        self.assertIs(pool._get_conn(), conn)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    body = b"x" * 10000
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(self.body)))
+        self.send_header("X-Token", "a")
+        self.send_header("X-Token", "b")
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _ClosingHandler(_Handler):
+    """Hangs up after every response without sending ``Connection: close``."""
+
+    def do_GET(self):
+        super().do_GET()
+        self.close_connection = True
+
+
+class _HangUpOnPostHandler(_Handler):
+    """Processes POSTs but hangs up instead of answering them."""
+
+    posts = []
+
+    def do_POST(self):
+        self.posts.append(self.rfile.read(int(self.headers["Content-Length"])))
+        self.close_connection = True
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients closing half-read responses reset the connection
+        pass
+
+
+class TestURLOpen(unittest.TestCase):
+    """Test urlopen against a local HTTP server."""
+
+    def setUp(self):
+        server = _Server(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.pool = HTTPConnectionPool("127.0.0.1", server.server_port)
+        self.addCleanup(self.pool.close)
+
+    def test_preloaded_response_reuses_connection(self):
+        """The connection goes back to the pool once the body is read."""
+        for _ in range(2):
+            response = self.pool.urlopen("GET", "/")
+            self.assertEqual(response.data, _Handler.body)
+
+        self.assertEqual(self.pool.num_connections, 1)
+        self.assertEqual(self.pool.num_requests, 2)
+        self.assertEqual(len(self.pool.pool), 1)
+
+    def test_repeated_headers_are_kept(self):
+        """Every value of a repeated response header is available."""
+        response = self.pool.urlopen("GET", "/")
+        self.assertEqual(response.headers.getlist("x-token"), ["a", "b"])
+        self.assertEqual(response.headers["Content-Length"], "10000")
+
+    def test_streamed_response(self):
+        """Without preloading, the body is read on demand."""
+        response = self.pool.urlopen("GET", "/", preload_content=False)
+        self.assertEqual(len(self.pool.pool), 0)
+
+        chunks = list(response.stream(4096))
+        self.assertEqual([len(c) for c in chunks], [4096, 4096, 1808])
+        self.assertEqual(b"".join(chunks), _Handler.body)
+        # Reaching the end of the body released the connection
+        self.assertEqual(len(self.pool.pool), 1)
+
+    def test_closing_unread_response_discards_connection(self):
+        """A connection with unread body data isn't reused."""
+        response = self.pool.urlopen("GET", "/", preload_content=False)
+        response.read(100)
+        response.close()
+
+        self.assertEqual(self.pool.num_connections, 0)
+        self.assertEqual(len(self.pool.pool), 0)
+
+    def test_request_timeout_applies_to_socket(self):
+        """Each request sets its own timeout on the pooled connection."""
+        self.pool.urlopen("GET", "/")
+        conn = self.pool.pool[0]
+
+        self.pool.urlopen("GET", "/", timeout=2.5)
+        self.assertEqual((conn.timeout, conn.sock.gettimeout()), (2.5, 2.5))
+
+        self.pool.urlopen("GET", "/")
+        self.assertIsNone(conn.sock.gettimeout())
+
+    def test_connection_closed_by_server_is_replaced(self):
+        """Reusing a connection the server hung up on opens a new one."""
+        server = _Server(("127.0.0.1", 0), _ClosingHandler)
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        pool = HTTPConnectionPool("127.0.0.1", server.server_port)
+        self.addCleanup(pool.close)
+
+        for _ in range(3):
+            self.assertEqual(pool.urlopen("GET", "/").data, _Handler.body)
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_unanswered_post_is_not_resent(self):
+        """A POST the server may have processed isn't sent twice."""
+        server = _Server(("127.0.0.1", 0), _HangUpOnPostHandler)
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        pool = HTTPConnectionPool("127.0.0.1", server.server_port)
+        self.addCleanup(pool.close)
+        _HangUpOnPostHandler.posts = []
+
+        pool.urlopen("GET", "/")
+        with self.assertRaises(http.client.RemoteDisconnected):
+            pool.urlopen("POST", "/charge", body=b"amount=100")
+
+        self.assertEqual(_HangUpOnPostHandler.posts, [b"amount=100"])
+
+    def test_pipelined_requests_share_connection(self):
+        """A batch of GETs is answered in order over one connection."""
+        responses = self.pool.urlopen_many([("GET", f"/{n}", None, {"X-N": str(n)}) for n in range(3)])
+
+        self.assertEqual([r.status for r in responses], [200, 200, 200])
+        self.assertEqual([r.data for r in responses], [_Handler.body] * 3)
+        self.assertEqual([r.request_url for r in responses], ["/0", "/1", "/2"])
+        self.assertEqual(self.pool.num_connections, 1)
+        self.assertEqual(self.pool.num_requests, 3)
+        self.assertEqual(len(self.pool.pool), 1)
+
+        # The connection is still usable afterwards
+        self.assertEqual(self.pool.urlopen("GET", "/").data, _Handler.body)
+
+    def test_pipelined_requests_resent_after_hangup(self):
+        """Requests the server hung up on are resent; answered ones are kept."""
+        server = _Server(("127.0.0.1", 0), _ClosingHandler)
+        threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        pool = HTTPConnectionPool("127.0.0.1", server.server_port)
+        self.addCleanup(pool.close)
+
+        responses = pool.urlopen_many([("GET", f"/{n}", None, None) for n in range(3)])
+
+        self.assertEqual([r.data for r in responses], [_Handler.body] * 3)
+        self.assertEqual([r.request_url for r in responses], ["/0", "/1", "/2"])
+
+    def test_closed_responses_are_recycled(self):
+        """With recycle_responses, a closed response is reused for the next request."""
+        self.pool.recycle_responses = True
+        with self.pool.urlopen("GET", "/") as first:
+            self.assertEqual(first.data, _Handler.body)
+        self.assertIsNone(first.pool)
+
+        second = self.pool.urlopen("GET", "/")
+        self.assertIs(second, first)
+        self.assertEqual(second.data, _Handler.body)
+        self.assertEqual(second.headers.getlist("x-token"), ["a", "b"])
+        # Not closed, so not reused
+        self.assertIsNot(self.pool.urlopen("GET", "/"), second)
+
+    def test_responses_are_not_recycled_by_default(self):
+        """Without recycle_responses, closing a response doesn't make it reusable."""
+        with self.pool.urlopen("GET", "/") as first:
+            pass
+        self.assertIsNot(self.pool.urlopen("GET", "/"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
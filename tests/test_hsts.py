@@ -0,0 +1,47 @@
+"""
+Tests for HSTS URL upgrades.
+"""
+
+import unittest
+
+from ai_urllib4.util.hsts import HSTSHandler
+from ai_urllib4.util.url import _parse_cached
+
+
+class TestSecureURLParsed(unittest.TestCase):
+    """Test HSTSHandler.secure_url_parsed."""
+
+    def setUp(self):
+        self.handler = HSTSHandler()
+        self.handler.process_response(
+            "https://example.com/", {"Strict-Transport-Security": "max-age=300; includeSubDomains"}
+        )
+
+    def test_upgrade(self):
+        """HTTP URLs for HSTS hosts and their subdomains are upgraded."""
+        parsed, upgraded = self.handler.secure_url_parsed(_parse_cached("http://example.com:80/a?b=1"))
+        self.assertTrue(upgraded)
+        self.assertEqual((parsed.scheme, parsed.netloc, parsed.port), ("https", "example.com", None))
+        self.assertEqual(parsed.geturl(), "https://example.com/a?b=1")
+
+        parsed, upgraded = self.handler.secure_url_parsed(_parse_cached("http://user@example.com:080/"))
+        self.assertTrue(upgraded)
+        self.assertEqual(parsed.geturl(), "https://user@example.com/")
+
+        parsed, upgraded = self.handler.secure_url_parsed(_parse_cached("http://www.example.com/"))
+        self.assertTrue(upgraded)
+        self.assertEqual(parsed.geturl(), "https://www.example.com/")
+
+    def test_no_upgrade(self):
+        """Other hosts and HTTPS URLs are returned unchanged."""
+        for url in ("http://example.org/", "https://example.com/"):
+            parsed = _parse_cached(url)
+            self.assertEqual(self.handler.secure_url_parsed(parsed), (parsed, False))
+
+        self.handler.cache.clear()
+        parsed = _parse_cached("http://example.com/")
+        self.assertEqual(self.handler.secure_url_parsed(parsed), (parsed, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
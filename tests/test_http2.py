@@ -0,0 +1,114 @@
+"""
+Tests for sharing HTTP/2 connections between concurrent requests.
+"""
+
+import os
+import socket
+import ssl
+import threading
+import unittest
+
+try:
+    import h2.config
+    import h2.connection
+    import h2.events
+except ImportError:  # pragma: no cover
+    h2 = None
+
+from ai_urllib4.connectionpool import HTTPSConnectionPool
+from ai_urllib4.http2.connection import HTTP2Connection
+
+CERTS_DIR = os.path.join(os.path.dirname(__file__), "..", "dummyserver", "certs")
+
+
+class _H2Server:
+    """TLS HTTP/2 server that answers only once ``batch`` requests are open."""
+
+    def __init__(self, batch):
+        self.batch = batch
+        self.connections = 0
+        self.context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+        self.context.load_cert_chain(
+            os.path.join(CERTS_DIR, "server.crt"), os.path.join(CERTS_DIR, "server.key")
+        )
+        self.context.set_alpn_protocols(["h2"])
+        self.sock = socket.create_server(("localhost", 0))
+        self.port = self.sock.getsockname()[1]
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self.sock.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+
+    def _handle(self, sock):
+        with self.context.wrap_socket(sock, server_side=True) as tls:
+            conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+            conn.initiate_connection()
+            tls.sendall(conn.data_to_send())
+            pending = []
+            while True:
+                data = tls.recv(65535)
+                if not data:
+                    return
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        pending.append(event)
+                if len(pending) >= self.batch:
+                    for event in pending:
+                        body = dict(event.headers)[b":path"]
+                        conn.send_headers(
+                            event.stream_id,
+                            [(":status", "200"), ("content-length", str(len(body)))],
+                        )
+                        conn.send_data(event.stream_id, body, end_stream=True)
+                    pending = []
+                tls.sendall(conn.data_to_send())
+
+    def close(self):
+        self.sock.close()
+
+
+class _Pool(HTTPSConnectionPool):
+    ConnectionCls = HTTP2Connection
+
+
+@unittest.skipIf(h2 is None, "h2 is not installed")
+class TestHTTP2Multiplexing(unittest.TestCase):
+    """Test that concurrent requests share one HTTP/2 connection."""
+
+    def setUp(self):
+        self.server = _H2Server(batch=3)
+        self.addCleanup(self.server.close)
+        context = ssl.create_default_context(cafile=os.path.join(CERTS_DIR, "cacert.pem"))
+        self.pool = _Pool("localhost", self.server.port, maxsize=1, block=True, context=context)
+        self.addCleanup(self.pool.close)
+
+    def test_concurrent_requests_share_connection(self):
+        """Requests run concurrently on one connection despite maxsize=1."""
+        results = {}
+
+        def fetch(n):
+            response = self.pool.urlopen("GET", f"/{n}", pool_timeout=5)
+            results[n] = (response.status, response.data)
+
+        threads = [threading.Thread(target=fetch, args=(n,)) for n in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(10)
+
+        # The server holds every response until all three requests are open
+        self.assertEqual(results, {n: (200, f"/{n}".encode()) for n in range(3)})
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.pool.num_connections, 1)
+        self.assertEqual(len(self.pool.pool), 1)
+        self.assertFalse(self.pool._shared)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,148 @@
+"""
+Tests for PoolManager request routing.
+"""
+
+import asyncio
+import http.server
+import json
+import socket
+import threading
+import time
+import unittest
+from unittest import mock
+
+from ai_urllib4.poolmanager import PoolManager
+from ai_urllib4.util import url as url_util
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/headers":
+            body = json.dumps(self.headers.items()).encode()
+        else:
+            body = self.path.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients closing half-read responses reset the connection
+        pass
+
+
+class TestPoolManager(unittest.TestCase):
+    """Test PoolManager against a local HTTP server."""
+
+    def setUp(self):
+        self.server = _Server(("127.0.0.1", 0), _Handler)
+        threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base = f"http://127.0.0.1:{self.server.server_port}"
+
+    def test_request(self):
+        """The path and query reach the server and pools are keyed by host."""
+        manager = PoolManager(hsts_enabled=False)
+        response = manager.request("GET", self.base + "/echo?a=1")
+
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.data, b"/echo?a=1")
+        self.assertEqual(list(manager.pools.keys()), [("http", f"127.0.0.1:{self.server.server_port}")])
+
+    def test_least_recently_used_pool_is_closed(self):
+        """Evicted pools are closed, and lookups refresh a pool's position."""
+        manager = PoolManager(num_pools=2, hsts_enabled=False)
+        first = manager.connection_from_url("http://a.example/")
+        second = manager.connection_from_url("http://b.example/")
+        manager.connection_from_url("http://a.example/x")
+        manager.connection_from_url("http://c.example/")
+
+        self.assertFalse(first.closed)
+        self.assertTrue(second.closed)
+        self.assertIs(manager.connection_from_url("http://a.example/"), first)
+
+    def test_url_is_parsed_once(self):
+        """The pool lookup and request line share one parse of the URL."""
+        url_util._parse_cached.cache_clear()
+        manager = PoolManager(hsts_enabled=False)
+        with mock.patch.object(url_util, "urlsplit", wraps=url_util.urlsplit) as urlsplit:
+            manager.request("GET", self.base + "/once")
+            manager.request("GET", self.base + "/once")
+
+        urlsplit.assert_called_once_with(self.base + "/once")
+
+    def test_request_many(self):
+        """Concurrent requests come back in order, with default headers applied."""
+        manager = PoolManager(hsts_enabled=False, headers={"X-Default": "1"})
+        # More requests than the async pool's maxsize of 10 wait their turn
+        responses = manager.request_many(
+            [("GET", f"{self.base}/{n}", {"headers": {"X-N": str(n)}}) for n in range(25)]
+        )
+
+        self.assertEqual([r.status for r in responses], [200] * 25)
+        self.assertEqual([r.data for r in responses], [f"/{n}".encode() for n in range(25)])
+        # The async pools belonged to the finished event loop
+        self.assertIsNone(manager._async_pools)
+
+    def test_request_many_with_sync_only_options(self):
+        """Connection options async pools don't support route through sync pools."""
+        manager = PoolManager(hsts_enabled=False, socket_options=[])
+        responses = manager.request_many([("GET", f"{self.base}/{n}", {}) for n in range(3)])
+
+        self.assertEqual([r.data for r in responses], [f"/{n}".encode() for n in range(3)])
+        self.assertEqual(len(manager.pools), 1)
+
+    def test_request_many_sends_caller_headers_once(self):
+        """Caller headers replace the pool's defaults, as with request()."""
+        manager = PoolManager(hsts_enabled=False, headers={"User-Agent": "mine/1.0"})
+        host = f"127.0.0.1:{self.server.server_port}"
+        (response,) = manager.request_many([("GET", self.base + "/headers", {"headers": {"host": host}})])
+        headers = json.loads(response.data)
+
+        self.assertEqual([v for k, v in headers if k.lower() == "user-agent"], ["mine/1.0"])
+        self.assertEqual([v for k, v in headers if k.lower() == "host"], [host])
+
+    def test_request_many_applies_timeout(self):
+        """Pool and per-request timeouts bound async requests too."""
+        # Accepts connections (through the backlog) but never answers
+        silent = socket.create_server(("127.0.0.1", 0))
+        self.addCleanup(silent.close)
+        url = f"http://127.0.0.1:{silent.getsockname()[1]}/"
+
+        for manager, kw in (
+            (PoolManager(hsts_enabled=False, timeout=0.2), {}),
+            (PoolManager(hsts_enabled=False), {"timeout": 0.2}),
+        ):
+            start = time.monotonic()
+            with self.assertRaises(TimeoutError):
+                manager.request_many([("GET", url, kw)])
+            self.assertLess(time.monotonic() - start, 2)
+
+    def test_request_many_refuses_running_loop(self):
+        """Inside an event loop, callers must await arequest_many instead."""
+        manager = PoolManager(hsts_enabled=False)
+
+        async def call():
+            with self.assertRaises(RuntimeError):
+                manager.request_many([("GET", self.base + "/", {})])
+            try:
+                return await manager.arequest_many([("GET", self.base + "/a", {})])
+            finally:
+                await manager.aclear()
+
+        responses = asyncio.run(call())
+        self.assertEqual(responses[0].data, b"/a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Tests for SmartClient.
+"""
+
+import threading
+import unittest
+from unittest import mock
+
+from ai_urllib4.poolmanager import PoolManager
+from ai_urllib4.smart_client import SmartClient
+
+
+def _response(status, data=b""):
+    response = mock.Mock(status=status, data=data, request_url="https://example.com/")
+    response.read.return_value = data
+    return response
+
+
+class TestSmartClient(unittest.TestCase):
+    """Test SmartClient request handling with the network mocked out."""
+
+    def setUp(self):
+        self.client = SmartClient(hsts_enabled=False)
+        patcher = mock.patch.object(PoolManager, "request", return_value=_response(200))
+        self.pool_request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_suggested_headers_are_cached_per_host(self):
+        """The advisor is consulted once per host within the TTL."""
+        with mock.patch.object(
+            self.client.ai_config, "suggest_headers", wraps=self.client.ai_config.suggest_headers
+        ) as suggest:
+            self.client.request("GET", "https://example.com/a")
+            self.client.request("GET", "https://example.com/b")
+            self.client.request("GET", "http://example.com/a")
+
+        self.assertEqual(suggest.call_count, 2)
+        headers = self.pool_request.call_args.kwargs["headers"]
+        self.assertEqual(headers["Accept"], "*/*")
+
+    def test_error_invalidates_cached_headers(self):
+        """A failed request makes the next one ask the advisor again."""
+        with mock.patch.object(
+            self.client.ai_config, "suggest_headers", wraps=self.client.ai_config.suggest_headers
+        ) as suggest:
+            self.client.request("GET", "https://example.com/")
+            self.pool_request.return_value = _response(500)
+            self.client.request("GET", "https://example.com/")
+            self.client.request("GET", "https://example.com/")
+
+        self.assertEqual(suggest.call_count, 2)
+
+    def test_failure_learned_late_invalidates_cached_headers(self):
+        """Headers cached before a failure was learned aren't reused after it."""
+        backend = mock.Mock()
+        backend.ask.return_value = '{"Accept": "text/html"}'
+        self.client.ai_config.backend = backend
+        learn = self.client.ai_config.learn_from_response
+        unblock = threading.Event()
+
+        def slow_learn(*args, **kwargs):
+            unblock.wait(5)
+            learn(*args, **kwargs)
+
+        with mock.patch.object(self.client.ai_config, "learn_from_response", side_effect=slow_learn):
+            self.pool_request.return_value = _response(404)
+            self.client.request("GET", "https://example.com/", total_timeout=0)
+            # Asks before the failure is recorded, so gets the defaults
+            self.pool_request.return_value = _response(200)
+            self.client.request("GET", "https://example.com/")
+            backend.ask.assert_not_called()
+
+            unblock.set()
+            self.client.get_domain_insights("example.com")
+            self.client.request("GET", "https://example.com/")
+
+        backend.ask.assert_called_once()
+        self.assertEqual(self.pool_request.call_args.kwargs["headers"]["Accept"], "text/html")
+
+    def test_learning_happens_in_background(self):
+        """Responses are learned from off-thread and flushed before reading insights."""
+        with mock.patch.object(
+            self.client.ai_config, "learn_from_response", wraps=self.client.ai_config.learn_from_response
+        ) as learn:
+            self.client.request("GET", "https://example.com/")
+            self.pool_request.return_value = _response(500)
+            self.client.request("GET", "https://example.com/")
+            insights = self.client.get_domain_insights("example.com")
+
+        self.assertEqual(insights["total_requests"], 2)
+        self.assertEqual(insights["success_rate"], 0.5)
+        # The learner sees a summary, not the response itself
+        summary = learn.call_args.args[1]
+        self.assertEqual((summary.status, summary.data), (500, b""))
+
+    @mock.patch("ai_urllib4.smart_client.random.uniform", side_effect=lambda a, b: b)
+    def test_retry_backoff_is_capped(self, uniform):
+        """Retry delays grow up to the cap, and retries stop at the deadline."""
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        self.pool_request.return_value = _response(429)
+        with mock.patch("ai_urllib4.smart_client.time.monotonic", side_effect=lambda: clock[0]), \
+                mock.patch("ai_urllib4.smart_client.time.sleep", side_effect=sleep) as sleep_mock:
+            self.client.request("GET", "https://example.com/", total_timeout=250)
+
+        self.assertEqual([c.args[0] for c in sleep_mock.call_args_list], [30, 60, 60, 60])
+        self.assertEqual(self.pool_request.call_count, 5)
+
+    @mock.patch("ai_urllib4.smart_client.random.uniform", side_effect=lambda a, b: b)
+    def test_attempt_timeout_is_clamped_to_deadline(self, uniform):
+        """The last attempt's timeout is cut down to the time left."""
+        clock = [0.0]
+
+        def sleep(seconds):
+            clock[0] += seconds
+
+        self.pool_request.return_value = _response(429)
+        with mock.patch("ai_urllib4.smart_client.time.monotonic", side_effect=lambda: clock[0]), \
+                mock.patch("ai_urllib4.smart_client.time.sleep", side_effect=sleep):
+            self.client.request("GET", "https://example.com/", total_timeout=100)
+
+        timeouts = [c.kwargs["timeout"] for c in self.pool_request.call_args_list]
+        self.assertEqual(timeouts, [30.0, 30.0, 10.0])
+
+    @mock.patch("ai_urllib4.smart_client.time.sleep")
+    def test_connection_is_released_before_backoff(self, sleep):
+        """A failed response gives its connection back before the retry wait."""
+        failed = _response(429)
+        self.pool_request.side_effect = [failed, _response(200)]
+        sleep.side_effect = lambda seconds: failed.release_conn.assert_called_once_with()
+
+        response = self.client.request("GET", "https://example.com/", total_timeout=1000)
+
+        self.assertEqual(response.status, 200)
+        sleep.assert_called_once()
+
+    @mock.patch("ai_urllib4.smart_client.time.sleep")
+    def test_retry_stops_at_deadline(self, sleep):
+        """No retry is attempted if its delay would pass the deadline."""
+        self.pool_request.return_value = _response(429)
+        response = self.client.request("GET", "https://example.com/", total_timeout=5)
+
+        self.assertEqual(response.status, 429)
+        sleep.assert_not_called()
+        self.assertEqual(self.pool_request.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()